@@ -0,0 +1,163 @@
+"""
+Parquet cache of cleaned chunks.
+
+clean_chunk() output only depends on the source bytes and the cleaning
+code, so a load can store every cleaned chunk (one zstd Parquet file each,
+plus a manifest with its end offset and cleaning counters) under a key of
+content fingerprint + cleaning version. Later loads of the same content
+replay those files straight into the writers instead of parsing and
+cleaning the CSV again.
+
+An entry is built in `<key>.partial` and renamed into place once the load
+that wrote it finished. While it is being built, every stored chunk is
+appended to an index file, so after a failed load the contiguous prefix of
+the partial entry can be replayed and the next load only has to clean the
+CSV from that prefix's end offset on (extending the same entry).
+Chunk boundaries are those of the run(s) that wrote the entry.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+
+import pandas as pd
+
+CACHE_FORMAT = 1
+MANIFEST = "manifest.json"
+# Index of a partial entry: one JSON line per stored chunk, in store order
+PARTIAL_INDEX = "chunks.jsonl"
+
+
+def cache_path(root: str, fingerprint: str, cleaning_version: int, variant: str = "") -> str:
+    """Directory of the entry for one source content and cleaning version (and variant)."""
+    suffix = f"-{variant}" if variant else ""
+    return os.path.join(root, f"{fingerprint.replace(':', '-')}-v{cleaning_version}{suffix}")
+
+
+def load_manifest(path: str | None) -> dict | None:
+    """
+    The entry's manifest, or None when there is nothing to replay.
+
+    Without a complete entry, falls back to the contiguous chunk prefix of
+    `<path>.partial` (manifest["complete"] is False then).
+    """
+    if not path:
+        return None
+    if not os.path.exists(os.path.join(path, MANIFEST)):
+        return load_partial_manifest(path)
+    with open(os.path.join(path, MANIFEST), encoding="utf-8") as fh:
+        manifest = json.load(fh)
+    if manifest.get("format") != CACHE_FORMAT:
+        return None
+    manifest["path"] = path
+    manifest["complete"] = True
+    return manifest
+
+
+def load_partial_manifest(path: str) -> dict | None:
+    """Chunks #1..n of a partial entry that were stored without a gap, or None."""
+    index = os.path.join(path + ".partial", PARTIAL_INDEX)
+    if not os.path.exists(index):
+        return None
+    stored = {}
+    with open(index, encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                record = json.loads(line)
+            except ValueError:  # torn last line of a crashed run
+                break
+            if record.get("format") != CACHE_FORMAT:
+                return None
+            stored[record["chunk"]] = record["entry"]
+    chunks = []
+    while len(chunks) in stored:
+        chunks.append(stored[len(chunks)])
+    if not chunks:
+        return None
+    return {"format": CACHE_FORMAT, "path": path + ".partial", "chunks": chunks, "complete": False}
+
+
+def open_cache_writer(path: str, partial: dict | None = None) -> dict:
+    """
+    Start a fresh entry (any earlier partial one is discarded), or keep
+    extending the prefix `partial` returned by load_manifest().
+    """
+    partial_dir = path + ".partial"
+    chunks = {}
+    if partial is None:
+        shutil.rmtree(partial_dir, ignore_errors=True)
+        os.makedirs(partial_dir)
+    else:
+        chunks = dict(enumerate(partial["chunks"]))
+        kept = {entry["file"] for entry in chunks.values()}
+        for name in os.listdir(partial_dir):
+            if name.startswith("chunk-") and name not in kept:
+                os.remove(os.path.join(partial_dir, name))
+    # Rewrite the index with only what is kept: chunks stored after a gap
+    # are re-cleaned with this run's boundaries
+    index = os.path.join(partial_dir, PARTIAL_INDEX)
+    with open(index + ".tmp", "w", encoding="utf-8") as fh:
+        for n, entry in chunks.items():
+            fh.write(json.dumps({"format": CACHE_FORMAT, "chunk": n, "entry": entry}) + "\n")
+    os.replace(index + ".tmp", index)
+    return {"path": path, "partial": partial_dir, "chunks": chunks, "lock": threading.Lock()}
+
+
+def store_chunk(cache: dict, chunk_num: int, end_offset: int, df: pd.DataFrame, stats: dict) -> None:
+    """Write one cleaned chunk (before any writer-side dedupe) into the entry."""
+    if chunk_num in cache["chunks"]:  # replayed from the partial entry
+        return
+    name = f"chunk-{chunk_num:06d}.parquet"
+    # Write under a temporary name so the index never points at a torn file
+    tmp = os.path.join(cache["partial"], name + ".tmp")
+    df.to_parquet(tmp, index=False, compression="zstd")
+    os.replace(tmp, os.path.join(cache["partial"], name))
+    counters = {k: v for k, v in stats.items() if isinstance(v, int)}
+    entry = {"file": name, "end_offset": end_offset, "stats": counters}
+    with cache["lock"]:
+        with open(os.path.join(cache["partial"], PARTIAL_INDEX), "a", encoding="utf-8") as fh:
+            fh.write(json.dumps({"format": CACHE_FORMAT, "chunk": chunk_num, "entry": entry}) + "\n")
+        cache["chunks"][chunk_num] = entry
+
+
+def finish_cache(cache: dict | None) -> None:
+    """Publish the entry; must hold a contiguous run of chunks from #1."""
+    if cache is None:
+        return
+    chunks = [cache["chunks"][n] for n in sorted(cache["chunks"])]
+    if sorted(cache["chunks"]) != list(range(len(chunks))):
+        print(f"[⚠] Clean cache: chunks missing, not publishing {cache['partial']}")
+        return
+    manifest = {"format": CACHE_FORMAT, "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "rows": sum(c["stats"].get("cleaned", 0) for c in chunks), "chunks": chunks}
+    with open(os.path.join(cache["partial"], MANIFEST), "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh)
+    os.remove(os.path.join(cache["partial"], PARTIAL_INDEX))
+    shutil.rmtree(cache["path"], ignore_errors=True)
+    os.replace(cache["partial"], cache["path"])
+    print(f"[🗃] Clean cache: stored {len(chunks)} chunks ({manifest['rows']:,} rows) in {cache['path']}")
+
+
+def resume_position(manifest: dict, resume: dict | None) -> int | None:
+    """
+    Index of the first chunk to replay, or None when the resume point does
+    not fall on one of the entry's chunk boundaries.
+    """
+    if not resume:
+        return 0
+    start = resume["chunk"]
+    chunks = manifest["chunks"]
+    if 0 < start <= len(chunks) and chunks[start - 1]["end_offset"] == resume["offset"]:
+        return start
+    return None
+
+
+def iter_cached_chunks(manifest: dict, start: int = 0):
+    """Yield (end_offset, (df, stats)) like iter_cleaned_chunks, reading Parquet lazily."""
+    for entry in manifest["chunks"][start:]:
+        read_start = time.perf_counter()
+        df = pd.read_parquet(os.path.join(manifest["path"], entry["file"]))
+        stats = dict(entry["stats"], stage_seconds={"read": time.perf_counter() - read_start})
+        yield entry["end_offset"], (df, stats)
@@ -0,0 +1,75 @@
+"""
+Open plain or compressed CSV inputs as one binary stream.
+
+The Kaggle export ships as a ~2 GB zip around an 11 GB CSV; streaming the
+decompressed bytes straight into the chunked reader avoids extracting it to
+disk first. Supported: .zip (the largest .csv member), .gz, .bz2 and .zst
+(needs the optional `zstandard` package). Offsets seen by the reader are
+positions in the decompressed CSV, so checkpoints stay valid; seeking to
+one re-decompresses from the start, and random-access byte ranges
+(SPLIT_WORKERS) are only available for plain files.
+"""
+
+import bz2
+import contextlib
+import gzip
+import io
+import os
+import zipfile
+from typing import BinaryIO, Iterator
+
+try:
+    import zstandard
+except ImportError:  # optional: only needed for .zst inputs
+    zstandard = None
+
+COMPRESSED_SUFFIXES = (".zip", ".gz", ".bz2", ".zst")
+_BUFFER_SIZE = 8 << 20
+
+
+def is_compressed(path: str) -> bool:
+    return path.lower().endswith(COMPRESSED_SUFFIXES)
+
+
+def _zip_member(zf: zipfile.ZipFile) -> zipfile.ZipInfo:
+    """The CSV inside an archive (the largest one if there are several)."""
+    members = [m for m in zf.infolist() if m.filename.lower().endswith(".csv")]
+    if not members:
+        raise ValueError(f"No .csv member in {zf.filename}")
+    return max(members, key=lambda m: m.file_size)
+
+
+def skip_to(fh: BinaryIO, position: int, target: int) -> None:
+    """Move a stream currently at `position` forward to `target`, even if it cannot seek."""
+    if fh.seekable():
+        fh.seek(target)
+        return
+    while position < target:
+        data = fh.read(min(_BUFFER_SIZE, target - position))
+        if not data:
+            raise ValueError(f"Stream ended at byte {position:,}, before {target:,}")
+        position += len(data)
+
+
+@contextlib.contextmanager
+def open_input(path: str) -> Iterator[BinaryIO]:
+    """Context manager yielding a readable, line-iterable binary stream for `path`."""
+    suffix = os.path.splitext(path)[1].lower()
+    with contextlib.ExitStack() as stack:
+        if suffix == ".zip":
+            zf = stack.enter_context(zipfile.ZipFile(path))
+            raw = stack.enter_context(zf.open(_zip_member(zf)))
+        elif suffix == ".gz":
+            raw = stack.enter_context(gzip.open(path, "rb"))
+        elif suffix == ".bz2":
+            raw = stack.enter_context(bz2.open(path, "rb"))
+        elif suffix == ".zst":
+            if zstandard is None:
+                raise RuntimeError(f"{path}: reading .zst inputs requires `pip install zstandard`")
+            fh = stack.enter_context(open(path, "rb"))
+            raw = stack.enter_context(zstandard.ZstdDecompressor().stream_reader(fh))
+        else:
+            yield stack.enter_context(open(path, "rb"))
+            return
+        # Buffered so readline()/line iteration pull large decompressed blocks
+        yield io.BufferedReader(raw, buffer_size=_BUFFER_SIZE)
@@ -13,6 +13,39 @@ MYSQL_PORT = int(os.getenv("MYSQL_PORT", 3306))
 MYSQL_USER = os.getenv("MYSQL_USER", "root")
 MYSQL_PASSWORD = os.getenv("MYSQL_PASSWORD", "")
 MYSQL_DB = os.getenv("MYSQL_DB", "nyc311")
+# "normalized" once sql/004 is applied: writes and aggregates go to service_requests_fact
+SCHEMA_MODE = os.getenv("SCHEMA_MODE", "wide").lower()
+
+# UPDATE ... LIMIT is rejected on the sql/004 join view, so it targets the fact table
+UPDATE_SQL = {
+    "wide": """
+        UPDATE service_requests
+        SET borough = borough
+        WHERE borough = %s
+        LIMIT 10
+    """,
+    "normalized": """
+        UPDATE service_requests_fact
+        SET borough_id = borough_id
+        WHERE borough_id = (SELECT borough_id FROM dim_borough WHERE borough = %s)
+        LIMIT 10
+    """,
+}
+# Normalized: count on the TINYINT codes, then attach the names (no four-way view join)
+BOROUGH_COUNTS_SQL = {
+    "wide": """
+        SELECT borough, COUNT(*) 
+        FROM service_requests
+        GROUP BY borough
+        LIMIT 5
+    """,
+    "normalized": """
+        SELECT b.borough, t.n
+        FROM (SELECT borough_id, COUNT(*) AS n FROM service_requests_fact GROUP BY borough_id) t
+        LEFT JOIN dim_borough b USING (borough_id)
+        LIMIT 5
+    """,
+}
 
 MONGO_URI = os.getenv("MONGODB_URI")
 MONGO_DB = os.getenv("MONGO_DB", "nyc311")
@@ -41,15 +74,7 @@ def worker_mysql_updates(n: int = 50):
     with conn.cursor() as cur:
         for _ in range(n):
             rand_borough = random.choice(["MANHATTAN", "BROOKLYN", "QUEENS"])
-            cur.execute(
-                """
-                UPDATE service_requests
-                SET borough = borough
-                WHERE borough = %s
-                LIMIT 10
-                """,
-                (rand_borough,),
-            )
+            cur.execute(UPDATE_SQL[SCHEMA_MODE], (rand_borough,))
             time.sleep(0.05)
     conn.close()
     print("[MySQL] Updates thread done")
@@ -59,14 +84,7 @@ def worker_mysql_queries(n: int = 50):
     conn = get_mysql_conn()
     with conn.cursor() as cur:
         for _ in range(n):
-            cur.execute(
-                """
-                SELECT borough, COUNT(*) 
-                FROM service_requests
-                GROUP BY borough
-                LIMIT 5
-                """
-            )
+            cur.execute(BOROUGH_COUNTS_SQL[SCHEMA_MODE])
             _ = cur.fetchall()
             time.sleep(0.05)
     conn.close()
@@ -86,6 +104,8 @@ def worker_mongo_queries(n: int = 50):
 
 
 def run_concurrent_ops():
+    if SCHEMA_MODE not in UPDATE_SQL:
+        raise ValueError(f"Unknown SCHEMA_MODE={SCHEMA_MODE!r} (expected one of {tuple(UPDATE_SQL)})")
     if not MONGO_URI:
         raise RuntimeError("MONGODB_URI is not set for concurrent_ops")
 
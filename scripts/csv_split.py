@@ -0,0 +1,115 @@
+"""
+Raw CSV splitting helpers for parallel NYC 311 ingestion.
+
+The parsers in ingest_mysql.py work on whole CSV records, so every block
+handed out here starts and ends on a record boundary. NYC 311 descriptors
+can contain quoted newlines, so boundaries are only cut where the running
+count of double quotes is even (i.e. outside a quoted field).
+"""
+
+import csv
+import os
+from itertools import islice
+from typing import BinaryIO, Callable, Iterable, Iterator
+
+
+def _is_quote_balanced(data: bytes) -> bool:
+    """True if `data` does not end inside a quoted CSV field."""
+    return data.count(b'"') % 2 == 0
+
+
+def _field_count(line: bytes) -> int:
+    """Number of CSV fields in a single physical line."""
+    return len(next(csv.reader([line.decode("utf-8", errors="replace")]), []))
+
+
+def read_header(fh: BinaryIO) -> bytes:
+    """Read the header record (including its newline) from the current position."""
+    header = fh.readline()
+    while header and not _is_quote_balanced(header):
+        header += fh.readline()
+    return header
+
+
+def iter_csv_blocks(lines: Iterable[bytes], rows_per_block: int | Callable[[], int]) -> Iterator[bytes]:
+    """
+    Yield raw blocks of ~rows_per_block complete CSV records from an iterable of lines.
+
+    A binary file object works directly. A block may hold fewer records than
+    lines when quoted fields span lines; it is extended line by line until
+    its quotes are balanced. rows_per_block may be a callable, re-read before
+    every block, so the block size can change while the file is being read.
+    """
+    lines = iter(lines)
+    while True:
+        n_rows = rows_per_block() if callable(rows_per_block) else rows_per_block
+        block = b"".join(islice(lines, n_rows))
+        if not block:
+            return
+        while not _is_quote_balanced(block):
+            line = next(lines, b"")
+            if not line:
+                break
+            block += line
+        yield block
+
+
+def _find_record_start(fh: BinaryIO, offset: int, n_fields: int, limit: int) -> int:
+    """
+    First record boundary at or after `offset` (or `limit` if none before it).
+
+    After seeking into the middle of the file we cannot know whether we are
+    inside a quoted field, so a line only counts as a record start when it is
+    quote-balanced and has the header's field count. Continuation lines of a
+    multi-line descriptor practically never satisfy both.
+    """
+    fh.seek(offset)
+    fh.readline()  # discard the (probably partial) line we landed in
+    while True:
+        pos = fh.tell()
+        if pos >= limit:
+            return limit
+        line = fh.readline()
+        if not line:
+            return limit
+        if _is_quote_balanced(line) and _field_count(line) == n_fields:
+            return pos
+
+
+def compute_byte_ranges(path: str, n_ranges: int) -> tuple[bytes, list[tuple[int, int]]]:
+    """
+    Split a CSV into up to n_ranges newline-aligned, quote-aware byte ranges.
+
+    Returns (header, [(start, end), ...]); ranges cover every data record
+    exactly once and never include the header. Only a few lines around each
+    cut point are read, so this is cheap even for the 11 GB export.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as fh:
+        header = read_header(fh)
+        data_start = fh.tell()
+        n_fields = _field_count(header)
+
+        step = max(1, (size - data_start) // max(1, n_ranges))
+        bounds = [data_start]
+        for i in range(1, n_ranges):
+            target = data_start + i * step
+            if target <= bounds[-1]:
+                continue
+            cut = _find_record_start(fh, target - 1, n_fields, size)
+            if bounds[-1] < cut < size:
+                bounds.append(cut)
+        bounds.append(size)
+
+    return header, [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def iter_range_lines(fh: BinaryIO, start: int, end: int) -> Iterator[bytes]:
+    """Yield the lines of a byte range produced by compute_byte_ranges."""
+    fh.seek(start)
+    pos = start
+    for line in fh:
+        if pos >= end:
+            return
+        pos += len(line)
+        yield line
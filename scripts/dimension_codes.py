@@ -0,0 +1,85 @@
+"""
+Small-int codes for the normalized schema (sql/004_normalize_service_requests.sql).
+
+agency, complaint_type, descriptor and borough are stored in dimension
+tables and referenced by id from service_requests_fact. Ids are cached
+in-process: each dimension table is read once, and a value not seen
+before costs one INSERT IGNORE + SELECT round-trip the first time it
+appears, on a short-lived connection of its own so the writer's open
+transaction (group commit) is never committed early. A chunk is encoded
+per distinct value, not per row.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+# column -> (dimension table, id column)
+DIMENSIONS = {
+    "agency": ("dim_agency", "agency_id"),
+    "complaint_type": ("dim_complaint_type", "complaint_type_id"),
+    "descriptor": ("dim_descriptor", "descriptor_id"),
+    "borough": ("dim_borough", "borough_id"),
+}
+FACT_COLUMNS = ["unique_key", "created_date", "closed_date", "agency_id", "complaint_type_id",
+                "descriptor_id", "borough_id", "latitude", "longitude"]
+
+_CODES: dict = {}  # column -> {value: id}, filled lazily per process
+_LOCK = threading.Lock()  # writer threads share the cache
+
+
+def _fetch_codes(conn, column: str, values: list[str] | None = None) -> None:
+    """Cache ids for `values` (or the whole dimension table when None)."""
+    table, id_col = DIMENSIONS[column]
+    sql = f"SELECT {id_col}, {column} FROM {table}"
+    if values is not None:
+        sql += f" WHERE {column} IN ({','.join(['%s'] * len(values))})"
+    with conn.cursor() as cur:
+        cur.execute(sql, values)
+        _CODES.setdefault(column, {}).update((value, code) for code, value in cur.fetchall())
+
+
+def _add_values(connect, column: str, values: list[str]) -> None:
+    """Insert new dimension values on a fresh `connect()` connection (committed there) and cache their ids."""
+    table, _ = DIMENSIONS[column]
+    conn = connect()
+    try:
+        with conn.cursor() as cur:
+            cur.executemany(f"INSERT IGNORE INTO {table} ({column}) VALUES (%s)", [(v,) for v in values])
+        conn.commit()
+        _fetch_codes(conn, column, values)
+    finally:
+        conn.close()
+
+
+def codes_for(conn, column: str, values: list[str], connect) -> np.ndarray:
+    """
+    Ids for distinct `values` of one dimension column, creating missing ones.
+
+    Known ids are read on `conn`; missing values are added through `connect`.
+    """
+    with _LOCK:
+        if column not in _CODES:
+            _fetch_codes(conn, column)
+        cache = _CODES[column]
+        missing = [v for v in values if v not in cache]
+        if missing:
+            _add_values(connect, column, missing)
+            print(f"[🏷] {DIMENSIONS[column][0]}: +{len(missing)} values")
+        return np.array([cache[v] for v in values], dtype=np.int64)
+
+
+def encode_dimensions(conn, df: pd.DataFrame, connect) -> pd.DataFrame:
+    """
+    Replace the dimension columns of a cleaned chunk by their ids (FACT_COLUMNS order).
+
+    `connect` opens the separate connection new dimension values are inserted on.
+    """
+    out = df.copy(deep=False)
+    for column, (_, id_col) in DIMENSIONS.items():
+        codes, uniques = pd.factorize(df[column])
+        ids = np.append(codes_for(conn, column, [str(u) for u in uniques], connect), 0)
+        # NA code -1 picks the trailing slot and is masked out
+        out[id_col] = pd.arrays.IntegerArray(ids[codes], codes < 0)
+    return out[FACT_COLUMNS]
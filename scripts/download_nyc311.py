@@ -6,6 +6,8 @@ import zipfile
 DATASET_SLUG = "nidhirastogi/311-service-requests-from-2010-to-present"
 # FILE_NAME = "311_Service_Requests_from_2011.csv"      file with 1,2 GB
 FILE_NAME = "311_Service_Requests_from_2010_to_Present.csv/311_Service_Requests_from_2010_to_Present.csv"    #file with 11 GB
+# Keep the downloaded zip instead of extracting it (ingest_mysql.py streams .zip inputs directly)
+KEEP_ZIP = os.getenv("NYC311_KEEP_ZIP", "false").lower() in ("1", "true", "yes")
 
 
 
@@ -13,7 +15,8 @@ FILE_NAME = "311_Service_Requests_from_2010_to_Present.csv/311_Service_Requests_
 def download_nyc311_from_kaggle(
     dataset: str = DATASET_SLUG,
     file_name: str = FILE_NAME,
-    dest: str = "./data"
+    dest: str = "./data",
+    keep_zip: bool = KEEP_ZIP
 ) -> str:
     os.makedirs(dest, exist_ok=True)
 
@@ -29,7 +32,10 @@ def download_nyc311_from_kaggle(
     zip_path = os.path.join(dest, base_filename + ".zip")
     csv_path = os.path.join(dest, base_filename)
 
-    if os.path.exists(zip_path):
+    if os.path.exists(zip_path) and keep_zip:
+        print(f"[📦] Keeping {zip_path} compressed (set NYC311_CSV={zip_path} to ingest it)")
+        return zip_path
+    elif os.path.exists(zip_path):
         print(f"[📦] Extracting {zip_path}...")
         with zipfile.ZipFile(zip_path, "r") as zf:
             zf.extractall(dest)
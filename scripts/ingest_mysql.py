@@ -1,5 +1,15 @@
+import asyncio
+import csv
+import functools
+import glob
+import io
+import itertools
 import os
+import queue
+import threading
 import time
+import tempfile
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 import psutil
 import pymysql
 import pandas as pd
@@ -7,6 +17,31 @@ import numpy as np
 from dotenv import load_dotenv
 import warnings
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # optional: only needed for CSV_READER=arrow
+    pa = None
+    pa_csv = None
+
+try:
+    import aiomysql
+except ImportError:  # optional: only needed for ASYNC_PIPELINE=true
+    aiomysql = None
+
+from fast_datetime import parse_datetimes
+from nyc_zip_boroughs import boroughs_from_zips
+from csv_split import compute_byte_ranges, iter_csv_blocks, iter_range_lines, read_header
+from sql_values import encode_rows, iter_insert_statements
+from key_bitmap import mark_seen, new_key_bitmap
+from file_fingerprint import FINGERPRINT_MODES, fingerprint_file, fingerprint_mode
+from compressed_input import COMPRESSED_SUFFIXES, is_compressed, open_input, skip_to
+from dimension_codes import encode_dimensions
+from stage_timings import chunk_breakdown, iter_timed, summarize_stages, timed
+from clean_cache import cache_path, finish_cache, iter_cached_chunks, load_manifest, open_cache_writer, \
+    resume_position, store_chunk
+from quarantine import REJECT_REASONS, close_quarantine, open_quarantine, quarantine_rejects, rejected_rows
+
 warnings.filterwarnings("ignore", category=UserWarning, module="pandas")
 
 load_dotenv()
@@ -17,11 +52,96 @@ USER = os.getenv("MYSQL_USER", "root")
 PWD = os.getenv("MYSQL_PASSWORD", "")
 DB = os.getenv("MYSQL_DB", "nyc311")
 
-CSV_FILENAME = os.getenv("NYC311_CSV", "./data/nyc_311_2023_sample.csv")     #Change here to use sample dataset or full dataset
-BATCH_SIZE = int(os.getenv("BATCH_SIZE", "10000"))  # Tuned: balances memory (100MB/chunk) vs commit overhead
+CSV_FILENAME = os.getenv("NYC311_CSV", "./data/nyc_311_2023_sample.csv")     #Change here to use sample dataset or full dataset (.csv, .zip, .gz, .bz2 or .zst; or a directory/glob of them)
+BATCH_SIZE = int(os.getenv("BATCH_SIZE", "10000"))  # Rows per chunk (starting size when ADAPTIVE_BATCH=true)
+# Write engine: "upsert" (multi-row INSERT + ON DUPLICATE KEY UPDATE) or "load_data" (LOAD DATA LOCAL INFILE)
+INGEST_MODE = os.getenv("INGEST_MODE", "upsert").lower()
+INGEST_MODES = ("upsert", "load_data")
+# CSV parser: "pandas" (C engine, all columns) or "arrow" (multi-threaded pyarrow, REQUIRED_COLS only)
+CSV_READER = os.getenv("CSV_READER", "pandas").lower()
+CSV_READERS = ("pandas", "arrow")
+# Datetime parser: "fast" (dedupe + vectorized fixed-width parse) or "pandas" (pd.to_datetime at read time)
+DATE_PARSER = os.getenv("DATE_PARSER", "fast").lower()
+DATE_PARSERS = ("fast", "pandas")
+# Distinct timestamp strings remembered across chunks by the fast parser, least recently used evicted first (0 = per-chunk only)
+DATETIME_CACHE_SIZE = int(os.getenv("DATETIME_CACHE_SIZE", "0"))
+# Parse/clean worker processes; >1 enables the pipelined reader -> pool -> writer mode
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", "1"))
+# Byte-range workers; >1 splits the CSV so each process reads, cleans and inserts its own slice
+SPLIT_WORKERS = int(os.getenv("SPLIT_WORKERS", "1"))
+# Files ingested concurrently when NYC311_CSV names a directory or glob (each with its own connection)
+FILE_WORKERS = int(os.getenv("FILE_WORKERS", "1"))
+# Resume an interrupted load from its last checkpointed byte offset instead of starting over
+RESUME = os.getenv("RESUME", "false").lower() in ("1", "true", "yes")
+# Window reload: "delete" (DELETE the year, then insert) or "exchange" (load a staging
+# table and swap it in with EXCHANGE PARTITION; needs sql/002_partition_service_requests.sql)
+RELOAD_STRATEGY = os.getenv("RELOAD_STRATEGY", "delete").lower()
+RELOAD_STRATEGIES = ("delete", "exchange")
+# Staging tables are per year (service_requests_stage_p<year>), so files loaded by
+# different FILE_WORKERS never share one
+STAGING_TABLE = "service_requests_stage"
+# Named lock serializing pmax splits across concurrent file workers (seconds to wait for it)
+PARTITION_LOCK = "service_requests_partitions"
+PARTITION_LOCK_TIMEOUT = 600
+# Target schema: "wide" (service_requests table) or "normalized" (service_requests_fact + dim_*
+# tables behind a service_requests view; needs sql/004_normalize_service_requests.sql)
+SCHEMA_MODE = os.getenv("SCHEMA_MODE", "wide").lower()
+SCHEMA_MODES = ("wide", "normalized")
+FACT_TABLE = "service_requests_fact"
+# Insert statement: "upsert" always, or "auto" = plain INSERT (no-op ON DUPLICATE KEY clause) while
+# the target window was empty at load start (fresh reloads), upsert for resumed/incremental loads
+INSERT_STRATEGY = os.getenv("INSERT_STRATEGY", "upsert").lower()
+INSERT_STRATEGIES = ("upsert", "auto")
+# Drop the secondary indexes (sql/003) before loading and rebuild them once afterwards
+DEFER_INDEXES = os.getenv("DEFER_INDEXES", "false").lower() in ("1", "true", "yes")
+# Concurrent MySQL writer connections, each committing its own chunks
+WRITER_CONNECTIONS = int(os.getenv("WRITER_CONNECTIONS", "1"))
+# Group commit: keep several chunks (and their checkpoints) in one transaction and commit every
+# COMMIT_EVERY_ROWS rows or COMMIT_EVERY_SECONDS seconds, whichever comes first (0 = off; with
+# both off every chunk commits on its own)
+COMMIT_EVERY_ROWS = int(os.getenv("COMMIT_EVERY_ROWS", "0"))
+COMMIT_EVERY_SECONDS = float(os.getenv("COMMIT_EVERY_SECONDS", "0"))
+GROUP_COMMIT = COMMIT_EVERY_ROWS > 0 or COMMIT_EVERY_SECONDS > 0
+# Upper bound for one multi-row INSERT (also capped by the server's max_allowed_packet)
+MAX_STATEMENT_BYTES = int(os.getenv("MAX_STATEMENT_BYTES", str(16 * 1024 * 1024)))
+# Adaptive batch sizing: start at BATCH_SIZE and grow/shrink within [BATCH_SIZE_MIN, BATCH_SIZE_MAX]
+# from insert latency (TARGET_BATCH_SECONDS), rows/sec and process RSS (MEMORY_CEILING_MB per process)
+ADAPTIVE_BATCH = os.getenv("ADAPTIVE_BATCH", "false").lower() in ("1", "true", "yes")
+BATCH_SIZE_MIN = int(os.getenv("BATCH_SIZE_MIN", "1000"))
+BATCH_SIZE_MAX = int(os.getenv("BATCH_SIZE_MAX", "200000"))
+TARGET_BATCH_SECONDS = float(os.getenv("TARGET_BATCH_SECONDS", "2.0"))
+MEMORY_CEILING_MB = int(os.getenv("MEMORY_CEILING_MB", "1024"))
+# Skip unique_keys already written by an earlier chunk of this run (first copy wins)
+# instead of sending them to MySQL as upserts
+DEDUPE_ACROSS_CHUNKS = os.getenv("DEDUPE_ACROSS_CHUNKS", "false").lower() in ("1", "true", "yes")
+# Copy of a duplicated unique_key that clean_chunk keeps: the same rule as across chunks
+DUPLICATE_KEEP = "first" if DEDUPE_ACROSS_CHUNKS else "last"
+# Write rows dropped by cleaning/dedupe, with a reason code, to Parquet files under
+# QUARANTINE_DIR/<dataset>-<run timestamp>/ (empty = off; needs pyarrow)
+QUARANTINE_DIR = os.getenv("QUARANTINE_DIR", "")
+# Cache cleaned chunks as Parquet under CLEAN_CACHE_DIR (keyed by content fingerprint +
+# CLEANING_VERSION) and replay them on later loads of the same content (empty = off; needs pyarrow)
+CLEAN_CACHE_DIR = os.getenv("CLEAN_CACHE_DIR", "")
+# Idempotency key: "sample" (size + sampled blocks), "full" (hash every byte) or "off" (filename only)
+FINGERPRINT_MODE = os.getenv("FINGERPRINT_MODE", "sample").lower()
+# asyncio pipeline: reads/cleans in an executor while aiomysql writers commit (upsert mode only)
+ASYNC_PIPELINE = os.getenv("ASYNC_PIPELINE", "false").lower() in ("1", "true", "yes")
+# Session settings for the load: "default" (server defaults) or "bulk" (BULK_SESSION_SETTINGS,
+# restored afterwards; skips unique/foreign-key checks and, where permitted, binary logging)
+SESSION_PROFILE = os.getenv("SESSION_PROFILE", "default").lower()
+SESSION_PROFILES = ("default", "bulk")
+BULK_SESSION_SETTINGS = {
+    "unique_checks": 0,
+    "foreign_key_checks": 0,
+    "sql_log_bin": 0,  # needs SYSTEM_VARIABLES_ADMIN/SUPER; skipped otherwise
+    "bulk_insert_buffer_size": int(os.getenv("BULK_INSERT_BUFFER_SIZE", str(256 * 1024 * 1024))),
+}
+# Max cleaned chunks waiting for the writers (bounds memory in pipelined mode)
+PIPELINE_DEPTH = int(os.getenv("PIPELINE_DEPTH", str(max(2, 2 * PARSE_WORKERS, 2 * WRITER_CONNECTIONS))))
 
 # NYC 311 standard datetime format [web:21][web:23]
 DATETIME_FORMAT = "%m/%d/%Y %I:%M:%S %p"
+MYSQL_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 # Explicit columns to read (schema contract, prevents drift)
 REQUIRED_COLS = [
@@ -30,28 +150,98 @@ REQUIRED_COLS = [
     "latitude", "longitude"
 ]
 
+# Secondary indexes managed by DEFER_INDEXES (mirrors sql/003_add_service_requests_indexes.sql)
+SECONDARY_INDEXES = {
+    "idx_sr_created_date": "(created_date)",
+    "idx_sr_borough_complaint": "(borough, complaint_type)",
+    "idx_sr_closed_date": "(closed_date)",
+}
 
-def parse_date_range_from_filename(filename: str) -> tuple[str, str]:
+# Low-cardinality columns read as categoricals (a few codes per row instead of one string object each)
+CATEGORICAL_COLS = ["agency", "borough", "complaint_type"]
+DATE_COLS = ["created_date", "closed_date"]
+
+# Explicit Arrow types for REQUIRED_COLS (dates stay strings; clean_chunk parses them)
+ARROW_COLUMN_TYPES = {
+    "unique_key": "int64", "created_date": "string", "closed_date": "string",
+    "agency": "string", "complaint_type": "string", "descriptor": "string",
+    "borough": "string", "incident_zip": "string",
+    "latitude": "float64", "longitude": "float64",
+}
+
+# Cross-chunk cache for parse_datetimes (one per process)
+_DATETIME_CACHE: dict = {}
+# (host, port) -> statement byte limit, read from the server once per process
+_STATEMENT_LIMITS: dict = {}
+
+
+# Monthly extracts: "<year>-<MM>" / "<year>_<MM>" with nothing date-like after the month
+# (so "2023-12-31" or "2023_10k_rows" stay yearly); anything else falls back to the first
+# four digits, as before monthly files were supported
+MONTH_IN_FILENAME = r'((?:19|20)\d{2})[-_](0[1-9]|1[0-2])(?![0-9A-Za-z]|[-_/.]\d)'
+YEAR_IN_FILENAME = r'(\d{4})'
+
+
+def filename_window(filename: str) -> tuple[str, str]:
     """
-    Extract year from filename and return date range for cleanup.
-    
-    Example: "311_Service_Requests_from_2011.csv" → ('2011-01-01', '2012-01-01')
+    [start, end) date range a filename covers: a month when it names one, else its year.
+
+    >>> filename_window("311_Service_Requests_from_2011.csv")
+    ('2011-01-01', '2012-01-01')
+    >>> filename_window("311_2023-05.csv")
+    ('2023-05-01', '2023-06-01')
+    >>> filename_window("311_2023_12.csv.gz")
+    ('2023-12-01', '2024-01-01')
+    >>> filename_window("nyc311_20230115.csv")
+    ('2023-01-01', '2024-01-01')
+    >>> filename_window("311_2023_10k_rows.csv")
+    ('2023-01-01', '2024-01-01')
+    >>> filename_window("311_2023-12-31.csv")
+    ('2023-01-01', '2024-01-01')
     """
     import re
-    year_match = re.search(r'(\d{4})', filename)
+    month_match = re.search(MONTH_IN_FILENAME, filename)
+    if month_match:
+        year, month = month_match.group(1), month_match.group(2)
+        end = f"{int(year) + 1}-01-01" if month == "12" else f"{year}-{int(month) + 1:02d}-01"
+        return f"{year}-{month}-01", end
+    
+    year_match = re.search(YEAR_IN_FILENAME, filename)
     if not year_match:
         raise ValueError(f"Could not parse year from filename: {filename}")
-    
     year = year_match.group(1)
-    start_date = f"{year}-01-01"
-    end_date = f"{int(year) + 1}-01-01"
+    return f"{year}-01-01", f"{int(year) + 1}-01-01"
+
+
+def parse_date_range_from_filename(filename: str) -> tuple[str, str]:
+    """
+    Extract year (and month, for monthly extracts) from filename and return date range for cleanup.
     
+    Example: "311_Service_Requests_from_2011.csv" → ('2011-01-01', '2012-01-01')
+             "311_2023-05.csv" → ('2023-05-01', '2023-06-01')
+    (see filename_window for the exact rules; `python -m doctest scripts/ingest_mysql.py`)
+    """
+    start_date, end_date = filename_window(filename)
     print(f"[🔍] Parsed {filename} → date range {start_date} to {end_date}")
     return start_date, end_date
 
 
+# Columns added to ingestion_log after the original schema (name -> DDL),
+# back-filled onto existing tables by create_ingestion_log_table()
+INGESTION_LOG_EXTRA_COLUMNS = {
+    "ingest_mode": "VARCHAR(32) NULL",
+    "writer_connections": "INT NULL",
+    "load_seconds": "DECIMAL(10,2) NULL",
+    "index_build_seconds": "DECIMAL(10,2) NULL",
+    "content_fingerprint": "VARCHAR(96) NULL",
+    "session_profile": "VARCHAR(16) NULL",
+    "rejected_rows": "BIGINT NULL",
+    "quarantine_dir": "VARCHAR(512) NULL",
+}
+
+
 def create_ingestion_log_table(conn):
-    """Create idempotency tracking table."""
+    """Create idempotency tracking table (and add any newer columns)."""
     with conn.cursor() as cur:
         cur.execute("""
             CREATE TABLE IF NOT EXISTS ingestion_log (
@@ -62,21 +252,183 @@ def create_ingestion_log_table(conn):
                 rows_per_sec DECIMAL(10,2)
             )
         """)
+        cur.execute("""
+            SELECT COLUMN_NAME FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'ingestion_log'
+        """)
+        existing = {row[0] for row in cur.fetchall()}
+        for name, ddl in INGESTION_LOG_EXTRA_COLUMNS.items():
+            if name not in existing:
+                cur.execute(f"ALTER TABLE ingestion_log ADD COLUMN {name} {ddl}")
+                print(f"[🛠] ingestion_log: added column {name}")
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS ingestion_writer_log (
+                dataset_file VARCHAR(255) NOT NULL,
+                writer_id INT NOT NULL,
+                chunks INT NOT NULL,
+                ingested_rows BIGINT NOT NULL,
+                busy_seconds DECIMAL(10,2),
+                rows_per_sec DECIMAL(10,2),
+                loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (dataset_file, writer_id)
+            )
+        """)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS ingestion_stage_log (
+                dataset_file VARCHAR(255) NOT NULL,
+                stage VARCHAR(32) NOT NULL,
+                chunks INT NOT NULL,
+                total_seconds DECIMAL(12,4),
+                p50_seconds DECIMAL(12,4),
+                p95_seconds DECIMAL(12,4),
+                max_seconds DECIMAL(12,4),
+                loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (dataset_file, stage)
+            )
+        """)
+    conn.commit()
+
+
+def create_checkpoint_table(conn):
+    """Create the per-chunk checkpoint table used for resumable loads."""
+    with conn.cursor() as cur:
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS ingestion_checkpoint (
+                dataset_file VARCHAR(255) NOT NULL,
+                chunk_index INT NOT NULL,
+                byte_offset BIGINT NOT NULL,
+                rows_committed INT NOT NULL,
+                committed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (dataset_file, chunk_index)
+            )
+        """)
     conn.commit()
 
 
-def log_ingestion_start(conn, filename: str):
-    """Check if file already ingested; skip if present."""
+CHECKPOINT_SQL = """
+    REPLACE INTO ingestion_checkpoint (dataset_file, chunk_index, byte_offset, rows_committed)
+    VALUES (%s, %s, %s, %s)
+"""
+
+
+def save_checkpoint(conn, filename: str, chunk_index: int, byte_offset: int, rows: int,
+                    commit: bool = True) -> None:
+    """
+    Record a committed chunk (byte_offset = where the next chunk starts).
+
+    Written right after the chunk's own commit; if we die in between, the
+    resumed run re-sends that chunk, which the upsert/REPLACE writers absorb.
+    With group commit (commit=False) the checkpoint joins the chunk's open
+    transaction, so rows and checkpoints of a group land or roll back together.
+    """
     with conn.cursor() as cur:
-        cur.execute("SELECT ingested_rows FROM ingestion_log WHERE dataset_file = %s", (filename,))
+        cur.execute(CHECKPOINT_SQL, (filename, chunk_index, byte_offset, rows))
+    if commit:
+        conn.commit()
+
+
+def load_checkpoint(conn, filename: str) -> dict | None:
+    """
+    Find where an interrupted load can resume.
+
+    Parallel writers commit out of order, so only the contiguous prefix of
+    chunks starting at 0 counts; anything committed past a gap is re-sent.
+    """
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT chunk_index, byte_offset, rows_committed FROM ingestion_checkpoint
+            WHERE dataset_file = %s ORDER BY chunk_index
+        """, (filename,))
+        rows = cur.fetchall()
+    
+    resume = None
+    for expected, (chunk_index, byte_offset, rows_committed) in enumerate(rows):
+        if chunk_index != expected:
+            break
+        resume = {
+            "chunk": chunk_index + 1,
+            "offset": byte_offset,
+            "rows": (resume["rows"] if resume else 0) + rows_committed,
+        }
+    return resume
+
+
+def clear_checkpoints(conn, filename: str, from_chunk: int = 0) -> None:
+    """
+    Drop checkpoints for a dataset from chunk `from_chunk` on (caller commits).
+
+    A resumed run drops everything past its resume point: chunks committed
+    after a gap may be cut differently this time (ADAPTIVE_BATCH, a changed
+    BATCH_SIZE), and a stale row must not later join the contiguous prefix.
+    """
+    with conn.cursor() as cur:
+        cur.execute("DELETE FROM ingestion_checkpoint WHERE dataset_file = %s AND chunk_index >= %s",
+                    (filename, from_chunk))
+
+
+def log_writer_stats(conn, filename: str, writers: dict) -> None:
+    """Replace the per-writer throughput rows for a dataset (same txn as ingestion_log)."""
+    with conn.cursor() as cur:
+        cur.execute("DELETE FROM ingestion_writer_log WHERE dataset_file = %s", (filename,))
+        for writer_id, ws in sorted(writers.items()):
+            rps = ws["rows"] / ws["busy_seconds"] if ws["busy_seconds"] > 0 else 0
+            cur.execute("""
+                INSERT INTO ingestion_writer_log
+                    (dataset_file, writer_id, chunks, ingested_rows, busy_seconds, rows_per_sec)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            """, (filename, writer_id, ws["chunks"], ws["rows"], ws["busy_seconds"], rps))
+
+
+def log_stage_stats(conn, filename: str, stages: dict) -> None:
+    """Replace the per-stage timing rows for a dataset (same txn as ingestion_log)."""
+    with conn.cursor() as cur:
+        cur.execute("DELETE FROM ingestion_stage_log WHERE dataset_file = %s", (filename,))
+        for stage, st in stages.items():
+            cur.execute("""
+                INSERT INTO ingestion_stage_log
+                    (dataset_file, stage, chunks, total_seconds, p50_seconds, p95_seconds, max_seconds)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """, (filename, stage, st["chunks"], st["total"], st["p50"], st["p95"], st["max"]))
+
+
+def log_ingestion_start(conn, filename: str, fingerprint: str | None = None, path: str | None = None):
+    """
+    Check if file already ingested; skip if present.
+
+    With a content fingerprint, identical content is skipped under any
+    filename, and a known filename whose content changed is reloaded. Rows
+    logged before fingerprints existed still match by filename only; a row
+    fingerprinted in another FINGERPRINT_MODE is compared after re-hashing
+    `path` in that mode.
+    """
+    with conn.cursor() as cur:
+        if fingerprint:
+            cur.execute("SELECT dataset_file, ingested_rows FROM ingestion_log WHERE content_fingerprint = %s",
+                        (fingerprint,))
+            result = cur.fetchone()
+            if result:
+                print(f"[⏭] Content of {filename} already ingested as {result[0]} ({result[1]:,} rows). Skipping.")
+                return True
+        
+        cur.execute("SELECT ingested_rows, content_fingerprint FROM ingestion_log WHERE dataset_file = %s",
+                    (filename,))
         result = cur.fetchone()
-        if result:
-            print(f"[⏭] Dataset {filename} already ingested ({result[0]:,} rows). Skipping.")
-            return True
-    return False
+        if not result:
+            return False
+        rows, stored = result
+        if fingerprint and stored:
+            mode = fingerprint_mode(stored)
+            if mode != fingerprint_mode(fingerprint) and mode in FINGERPRINT_MODES and path:
+                if fingerprint_file(path, mode) == stored:
+                    print(f"[⏭] Dataset {filename} already ingested ({rows:,} rows, same content). Skipping.")
+                    return True
+            print(f"[🔄] Dataset {filename} changed since it was ingested ({rows:,} rows); reloading")
+            return False
+        print(f"[⏭] Dataset {filename} already ingested ({rows:,} rows). Skipping.")
+        return True
 
 
-def cleanup_previous_data(conn, filename: str):
+def cleanup_previous_data(conn, filename: str, table: str = "service_requests"):
     """Delete previous data from the target ingestion window."""
     try:
         start_date, end_date = parse_date_range_from_filename(filename)
@@ -85,8 +437,8 @@ def cleanup_previous_data(conn, filename: str):
         return
     
     with conn.cursor() as cur:
-        cur.execute("""
-            DELETE FROM service_requests
+        cur.execute(f"""
+            DELETE FROM {table}
             WHERE created_date >= %s AND created_date < %s
         """, (start_date, end_date))
         deleted = cur.rowcount
@@ -94,73 +446,257 @@ def cleanup_previous_data(conn, filename: str):
     conn.commit()
 
 
+def is_window_empty(conn, table: str, start_date: str, end_date: str) -> bool:
+    """
+    True if `table` has no rows with created_date in [start_date, end_date).
+
+    Commits right away: the main connection may sit idle for the whole load
+    (writer pool, split, async), and an open REPEATABLE READ snapshot would
+    hold back InnoDB purge until the end.
+    """
+    with conn.cursor() as cur:
+        cur.execute(f"""
+            SELECT 1 FROM {table}
+            WHERE created_date >= %s AND created_date < %s LIMIT 1
+        """, (start_date, end_date))
+        empty = cur.fetchone() is None
+    conn.commit()
+    return empty
+
+
+def get_year_partitions(conn, table: str = "service_requests") -> dict:
+    """Partition name -> upper bound (None for MAXVALUE) of a RANGE-partitioned table."""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT PARTITION_NAME, PARTITION_DESCRIPTION FROM information_schema.PARTITIONS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+            ORDER BY PARTITION_ORDINAL_POSITION
+        """, (table,))
+        return {
+            name: None if desc == "MAXVALUE" else int(desc)
+            for name, desc in cur.fetchall()
+        }
+
+
+def ensure_year_partition(conn, year: int) -> str:
+    """
+    Return the partition holding exactly `year`, splitting pmax if needed.
+
+    pmax is split into one partition per missing year so that exchanging
+    p{year} can never swap out a neighbouring year's rows. Runs under a
+    named lock: concurrent FILE_WORKERS would otherwise both reorganize
+    pmax from the same partition list and the second would fail.
+    """
+    name = f"p{year}"
+    with conn.cursor() as cur:
+        cur.execute("SELECT GET_LOCK(%s, %s)", (PARTITION_LOCK, PARTITION_LOCK_TIMEOUT))
+        if cur.fetchone()[0] != 1:
+            raise RuntimeError(f"Timed out waiting for lock {PARTITION_LOCK} to add partition {name}")
+        try:
+            partitions = get_year_partitions(conn)
+            if partitions.get(name) == year + 1:
+                return name
+            
+            bounds = [b for b in partitions.values() if b is not None]
+            if "pmax" not in partitions or not bounds or year < max(bounds):
+                raise ValueError(f"service_requests has no single-year partition for {year}")
+            
+            new_parts = ", ".join(
+                f"PARTITION p{y} VALUES LESS THAN ({y + 1})" for y in range(max(bounds), year + 1)
+            )
+            cur.execute(f"""
+                ALTER TABLE service_requests REORGANIZE PARTITION pmax INTO (
+                    {new_parts}, PARTITION pmax VALUES LESS THAN MAXVALUE
+                )
+            """)
+            print(f"[🧱] Added partitions p{max(bounds)}..{name}")
+            return name
+        finally:
+            cur.execute("SELECT RELEASE_LOCK(%s)", (PARTITION_LOCK,))
+            cur.fetchone()
+
+
+def staging_table_name(filename: str) -> str:
+    """Staging table for the year a file covers, e.g. service_requests_stage_p2023."""
+    start_date, _ = parse_date_range_from_filename(filename)
+    return f"{STAGING_TABLE}_p{start_date[:4]}"
+
+
+def prepare_staging_table(conn, staging: str, reset: bool = True) -> None:
+    """(Re)create the non-partitioned staging table used for partition exchange."""
+    with conn.cursor() as cur:
+        if reset:
+            cur.execute(f"DROP TABLE IF EXISTS {staging}")
+        cur.execute(f"SHOW TABLES LIKE '{staging}'")
+        if cur.fetchone() is None:
+            cur.execute(f"CREATE TABLE {staging} LIKE service_requests")
+            cur.execute(f"ALTER TABLE {staging} REMOVE PARTITIONING")
+            print(f"[🧱] Created staging table {staging}")
+    conn.commit()
+
+
+def exchange_year_partition(conn, filename: str, staging: str) -> None:
+    """
+    Swap the loaded staging table in as the file's year partition.
+
+    Rows dated outside the year cannot live in that partition, so they are
+    upserted straight into service_requests first. EXCHANGE PARTITION is a
+    metadata operation; afterwards the staging table holds the old year,
+    which is simply truncated.
+    """
+    start_date, end_date = parse_date_range_from_filename(filename)
+    partition = ensure_year_partition(conn, int(start_date[:4]))
+    
+    with conn.cursor() as cur:
+        cur.execute(f"""
+            REPLACE INTO service_requests
+            SELECT * FROM {staging}
+            WHERE created_date < %s OR created_date >= %s
+        """, (start_date, end_date))
+        moved = cur.rowcount
+        cur.execute(f"""
+            DELETE FROM {staging}
+            WHERE created_date < %s OR created_date >= %s
+        """, (start_date, end_date))
+        conn.commit()
+        if moved:
+            print(f"[↪] Upserted {moved:,} rows dated outside {start_date[:4]} directly")
+        
+        swap_start = time.time()
+        cur.execute(f"ALTER TABLE service_requests EXCHANGE PARTITION {partition} WITH TABLE {staging}")
+        print(f"[🔁] Exchanged partition {partition} in {time.time() - swap_start:.2f}s")
+        cur.execute(f"TRUNCATE TABLE {staging}")
+
+
+def get_secondary_indexes(conn, table: str) -> set:
+    """Names of the SECONDARY_INDEXES currently present on `table`."""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """, (table,))
+        return {row[0] for row in cur.fetchall()} & set(SECONDARY_INDEXES)
+
+
+def drop_secondary_indexes(conn, table: str) -> set:
+    """Drop the managed secondary indexes before a bulk load (one ALTER); returns the dropped names."""
+    present = sorted(get_secondary_indexes(conn, table))
+    if not present:
+        return set()
+    with conn.cursor() as cur:
+        cur.execute(f"ALTER TABLE {table} " + ", ".join(f"DROP INDEX {name}" for name in present))
+    print(f"[🧱] Deferred indexes on {table}: dropped {', '.join(present)}")
+    return set(present)
+
+
+def rebuild_secondary_indexes(conn, table: str, wanted: set) -> float:
+    """Build the missing indexes in `wanted` in a single ALTER; returns seconds spent."""
+    missing = sorted(set(wanted) - get_secondary_indexes(conn, table))
+    if not missing:
+        return 0.0
+    start = time.time()
+    with conn.cursor() as cur:
+        cur.execute(f"ALTER TABLE {table} " + ", ".join(
+            f"ADD INDEX {name} {SECONDARY_INDEXES[name]}" for name in missing
+        ))
+    elapsed = time.time() - start
+    print(f"[🧱] Rebuilt {', '.join(missing)} on {table} in {elapsed:.1f}s")
+    return elapsed
+
+
 def infer_borough_from_zip(zipcode: str) -> str | None:
-    """Infer NYC borough from ZIP code prefix."""
+    """Infer NYC borough from a single ZIP code (see boroughs_from_zips for columns)."""
     if not isinstance(zipcode, str) or len(zipcode) < 3:
         return None
-    prefix = zipcode[:3]
-    borough_map = {
-        "100": "MANHATTAN", "101": "MANHATTAN", "102": "MANHATTAN",
-        "103": "STATEN ISLAND", "104": "BRONX",
-        "111": "QUEENS", "112": "BROOKLYN", "113": "QUEENS", 
-        "114": "QUEENS", "116": "QUEENS"
-    }
-    return borough_map.get(prefix)
+    return boroughs_from_zips(pd.Series([zipcode])).iloc[0]
+
+
+def normalize_column_name(name: str) -> str:
+    """'Unique Key' -> 'unique_key' (NYC 311 export headers to schema names, minus any BOM)."""
+    return name.lstrip("\ufeff").strip().replace(" ", "_").lower()
+
 
+# Bump whenever clean_chunk() (or the reader options feeding it) changes its output,
+# so CLEAN_CACHE_DIR entries written by older code are not replayed
+CLEANING_VERSION = 1
 
-def clean_chunk(df: pd.DataFrame) -> tuple[pd.DataFrame, dict]:
+
+def clean_chunk(df: pd.DataFrame, stages: dict | None = None) -> tuple[pd.DataFrame, dict]:
     """
     Clean NYC 311 chunk with validation and telemetry.
     
-    Returns: (cleaned_df, cleaning_stats)
+    Returns: (cleaned_df, cleaning_stats); per-step seconds are added to
+    `stages` and returned as cleaning_stats["stage_seconds"]. Dropped rows
+    are counted per reason and, with QUARANTINE_DIR set, returned as
+    cleaning_stats["rejected"] for the writer's quarantine sink.
     """
-    df = df.copy()
+    stages = {} if stages is None else stages
     original_count = len(df)
     
-    # Normalize column names
-    df.columns = [c.strip().replace(" ", "_").lower() for c in df.columns]
-    
-    # Schema mapping (only keep expected columns)
-    colmap = {
-        "unique_key": "unique_key", "created_date": "created_date", 
-        "closed_date": "closed_date", "agency": "agency",
-        "complaint_type": "complaint_type", "descriptor": "descriptor",
-        "borough": "borough", "incident_zip": "incident_zip",
-        "latitude": "latitude", "longitude": "longitude"
-    }
-    df = df.rename(columns=colmap)
+    # Normalize column names (in place: callers hand over freshly parsed chunks)
+    df.columns = [normalize_column_name(c) for c in df.columns]
     
-    # Parse datetimes with explicit format (no warnings, faster)
-    for col in ["created_date", "closed_date"]:
-        if col in df.columns:
-            df[col] = pd.to_datetime(df[col], format=DATETIME_FORMAT, errors="coerce")
+    # Parse datetimes with explicit format (no warnings, faster); with
+    # DATE_PARSER=pandas read_block already parsed them unless a chunk had bad values
+    with timed(stages, "clean.dates"):
+        for col in DATE_COLS:
+            if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+                if DATE_PARSER == "fast":
+                    df[col] = parse_datetimes(df[col], DATETIME_FORMAT,
+                                              _DATETIME_CACHE, DATETIME_CACHE_SIZE)
+                else:
+                    df[col] = pd.to_datetime(df[col], format=DATETIME_FORMAT, errors="coerce")
     
     # Coerce numerics
-    for c in ["latitude", "longitude"]:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce")
-    
-    # Data quality filters (edge cases)
-    initial_rows = len(df)
+    with timed(stages, "clean.numerics"):
+        for c in ["latitude", "longitude"]:
+            if c in df.columns:
+                df[c] = pd.to_numeric(df[c], errors="coerce")
     
-    # 1. Drop rows missing required fields
-    df = df.dropna(subset=["unique_key", "created_date"])
+    # Data quality filters (edge cases); each drop is counted, and kept when quarantining
+    rejected = []
     
-    # 2. Remove duplicates
-    df = df.drop_duplicates(subset=["unique_key"], keep="last")
+    with timed(stages, "clean.required_dupes"):
+        # 1. Drop rows missing required fields
+        missing = df["unique_key"].isna() | df["created_date"].isna()
+        dropped_required = int(missing.sum())
+        if dropped_required:
+            if QUARANTINE_DIR:
+                rejected.append(rejected_rows(df, missing, "missing_required"))
+            df = df[~missing]
+        
+        # 2. Remove duplicates (DUPLICATE_KEEP: the last copy wins, like the
+        #    upsert, or the first with DEDUPE_ACROSS_CHUNKS)
+        dupes = df.duplicated(subset=["unique_key"], keep=DUPLICATE_KEEP)
+        dropped_dupes = int(dupes.sum())
+        if dropped_dupes:
+            if QUARANTINE_DIR:
+                rejected.append(rejected_rows(df, dupes, "duplicate_key"))
+            df = df[~dupes]
     
     # 3. Infer missing boroughs
-    if "borough" in df.columns and "incident_zip" in df.columns:
-        mask = df["borough"].isna()
-        df.loc[mask, "borough"] = df.loc[mask, "incident_zip"].astype(str).map(infer_borough_from_zip)
+    with timed(stages, "clean.boroughs"):
+        if "borough" in df.columns and "incident_zip" in df.columns:
+            mask = df["borough"].isna()
+            inferred = boroughs_from_zips(df.loc[mask, "incident_zip"])
+            if isinstance(df["borough"].dtype, pd.CategoricalDtype):
+                new_cats = set(inferred.dropna()) - set(df["borough"].cat.categories)
+                df["borough"] = df["borough"].cat.add_categories(sorted(new_cats))
+            df.loc[mask, "borough"] = inferred
     
     # 4. Filter invalid lat/lng (NYC bounds)
-    if "latitude" in df.columns and "longitude" in df.columns:
-        nyc_mask = (
-            (df["latitude"].between(40.5, 40.9)) & 
-            (df["longitude"].between(-74.3, -73.7))
-        )
-        df = df[nyc_mask]
+    with timed(stages, "clean.bounds"):
+        if "latitude" in df.columns and "longitude" in df.columns:
+            nyc_mask = (
+                (df["latitude"].between(40.5, 40.9)) & 
+                (df["longitude"].between(-74.3, -73.7))
+            )
+            bounds_filtered = int((~nyc_mask).sum())
+            if bounds_filtered and QUARANTINE_DIR:
+                rejected.append(rejected_rows(df, ~nyc_mask, "outside_nyc_bounds"))
+            df = df[nyc_mask]
+        else:
+            bounds_filtered = 0
     
     # Final column selection
     final_cols = ["unique_key", "created_date", "closed_date", "agency",
@@ -173,49 +709,283 @@ def clean_chunk(df: pd.DataFrame) -> tuple[pd.DataFrame, dict]:
     stats = {
         "original": original_count,
         "cleaned": cleaned_count,
-        "dropped_required": initial_rows - len(df.dropna(subset=["unique_key", "created_date"])),
-        "dropped_dupes": len(df) - cleaned_count,
-        "nyc_bounds_filtered": sum(~nyc_mask) if "latitude" in locals() else 0
+        "dropped_required": dropped_required,
+        "dropped_dupes": dropped_dupes,
+        "cross_chunk_dupes": 0,  # filled in by drop_seen_keys() on the writer side
+        "stage_seconds": stages,
+        "nyc_bounds_filtered": bounds_filtered,
     }
+    if rejected:
+        stats["rejected"] = pd.concat(rejected, ignore_index=True)
     
     print(f"[🧹] Chunk: {stats['cleaned']:,}/{stats['original']:,} rows "
-          f"(dropped: {stats['dropped_required']:,} req + {stats['dropped_dupes']:,} dupes)")
+          f"(dropped: {stats['dropped_required']:,} req + {stats['dropped_dupes']:,} dupes "
+          f"+ {stats['nyc_bounds_filtered']:,} out of bounds)")
     
     return df, stats
 
 
-def insert_batch(conn, df: pd.DataFrame) -> None:
-    """Transactional batch insert with rollback safety."""
+@functools.lru_cache(maxsize=8)
+def _required_header_names(header: bytes) -> dict:
+    """Map schema name -> raw header name for the REQUIRED_COLS present in a CSV header."""
+    # utf-8-sig: exports saved by Excel start with a BOM, which the parsers skip too
+    raw_names = next(csv.reader([header.decode("utf-8-sig")]))
+    wanted = {normalize_column_name(n): n for n in raw_names}
+    return {c: wanted[c] for c in REQUIRED_COLS if c in wanted}
+
+
+@functools.lru_cache(maxsize=8)
+def _pandas_read_options(header: bytes) -> dict:
+    """read_csv kwargs pushing the REQUIRED_COLS contract down into the parser."""
+    names = _required_header_names(header)
+    dtype = {names[c]: "category" for c in CATEGORICAL_COLS if c in names}
+    if "incident_zip" in names:
+        dtype[names["incident_zip"]] = str
+    options = {"usecols": list(names.values()), "dtype": dtype}
+    if DATE_PARSER == "pandas":
+        options["parse_dates"] = [names[c] for c in DATE_COLS if c in names]
+        options["date_format"] = DATETIME_FORMAT
+    else:
+        # leave dates as strings for the fast parser in clean_chunk
+        dtype.update({names[c]: str for c in DATE_COLS if c in names})
+    return options
+
+
+@functools.lru_cache(maxsize=8)
+def _arrow_convert_options(header: bytes):
+    """Arrow ConvertOptions selecting REQUIRED_COLS (by their raw header names) with explicit types."""
+    names = _required_header_names(header)
+    column_types = {}
+    for col, raw in names.items():
+        if col in CATEGORICAL_COLS:
+            column_types[raw] = pa.dictionary(pa.int32(), pa.string())
+        else:
+            column_types[raw] = ARROW_COLUMN_TYPES[col]
+    return pa_csv.ConvertOptions(
+        include_columns=list(names.values()),
+        column_types=column_types,
+        strings_can_be_null=True,
+    )
+
+
+def read_block(header: bytes, block: bytes) -> pd.DataFrame:
+    """Parse one raw CSV block with the configured CSV_READER."""
+    if CSV_READER == "arrow":
+        table = pa_csv.read_csv(
+            io.BytesIO(header + block),
+            read_options=pa_csv.ReadOptions(use_threads=True),
+            # descriptors may hold quoted newlines
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+            convert_options=_arrow_convert_options(header),
+        )
+        return table.to_pandas()
+    return pd.read_csv(io.BytesIO(header + block), **_pandas_read_options(header))
+
+
+def parse_clean_block(header: bytes, block: bytes, read_seconds: float = 0.0) -> tuple[pd.DataFrame, dict]:
+    """Worker entry point: parse a raw CSV block and run clean_chunk on it."""
+    stages = {"read": read_seconds}
+    with timed(stages, "parse"):
+        df = read_block(header, block)
+    return clean_chunk(df, stages)
+
+
+def statement_limit(conn) -> int:
+    """Largest INSERT to send: MAX_STATEMENT_BYTES, capped below max_allowed_packet."""
+    key = (getattr(conn, "host", None), getattr(conn, "port", None))
+    if key not in _STATEMENT_LIMITS:
+        with conn.cursor() as cur:
+            cur.execute("SELECT @@max_allowed_packet")
+            max_packet = int(cur.fetchone()[0])
+        _STATEMENT_LIMITS[key] = min(MAX_STATEMENT_BYTES, max_packet - 1024)
+    return _STATEMENT_LIMITS[key]
+
+
+# Key clause of the fresh-window INSERT: skips a cross-chunk duplicate (keeping the first
+# copy) without INSERT IGNORE, which would also turn strict-mode errors into warnings
+NOOP_KEY_CLAUSE = "\n        ON DUPLICATE KEY UPDATE unique_key=unique_key\n"
+
+
+def upsert_clause(columns) -> str:
+    """ON DUPLICATE KEY UPDATE for every column except unique_key."""
+    updates = ",\n          ".join(f"{c}=VALUES({c})" for c in columns if c != "unique_key")
+    return f"""
+        ON DUPLICATE KEY UPDATE
+          {updates}
+"""
+
+
+def build_insert_statements(df: pd.DataFrame, table: str, upsert: bool, max_bytes: int) -> list[bytes]:
+    """Multi-row INSERT statements (upsert or no-op key clause) for a chunk, each <= max_bytes."""
+    cols = ",".join(df.columns)
+    head = f"INSERT INTO {table} ({cols}) VALUES ".encode()
+    tail = (upsert_clause(df.columns) if upsert else NOOP_KEY_CLAUSE).encode()
+    return iter_insert_statements(head, encode_rows(df), tail, max_bytes)
+
+
+def insert_batch(conn, df: pd.DataFrame, table: str = "service_requests", upsert: bool = True,
+                 stages: dict | None = None, commit: bool = True) -> None:
+    """
+    Transactional batch insert with rollback safety.
+
+    Rows are encoded column-wise by sql_values and sent as a few multi-row
+    INSERTs sized to statement_limit(), instead of executemany() escaping
+    one Python tuple per row.
+
+    upsert=False sends a plain INSERT whose key clause is a no-op (no
+    per-column update clause, smaller statements and binlog); only safe when
+    the rows cannot already exist. A duplicate across chunks then keeps its
+    first copy, whereas the upsert keeps the last. Unlike INSERT IGNORE,
+    over-long values or invalid dates still fail in strict mode.
+
+    commit=False leaves the transaction open for group commit; a failure
+    then rolls back every chunk since the last commit.
+    """
     if df.empty:
         return
     
-    df = df.replace({np.nan: None, pd.NaT: None})
-    data = [tuple(row) for row in df.to_numpy()]
-    placeholders = ",".join(["%s"] * len(df.columns))
-    cols = ",".join(df.columns)
+    with timed(stages, "encode"):
+        statements = build_insert_statements(df, table, upsert, statement_limit(conn))
     
+    try:
+        with timed(stages, "insert"), conn.cursor() as cur:
+            for sql in statements:
+                cur.execute(sql)
+        if commit:
+            with timed(stages, "commit"):
+                conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f"[❌] Batch insert failed (rolled back): {e}")
+        raise
+
+
+def _tsv_field(df: pd.DataFrame, col: str) -> pd.Series:
+    """Encode one column as LOAD DATA text (\\N for NULL, backslash escapes)."""
+    series = df[col]
+    if pd.api.types.is_datetime64_any_dtype(series):
+        text = series.dt.strftime(MYSQL_DATETIME_FORMAT)
+    elif col == "unique_key":
+        text = series.astype("int64").astype(str)
+    elif pd.api.types.is_float_dtype(series):
+        text = series.round(6).astype(str)
+    else:
+        text = (series.astype(str)
+                .str.replace("\\", "\\\\", regex=False)
+                .str.replace("\t", "\\t", regex=False)
+                .str.replace("\n", "\\n", regex=False)
+                .str.replace("\r", "\\r", regex=False))
+    return text.where(series.notna(), "\\N")
+
+
+def write_tsv_batch(df: pd.DataFrame, fh) -> None:
+    """Serialize a cleaned chunk to tab-separated rows for LOAD DATA."""
+    fields = [_tsv_field(df, col) for col in df.columns]
+    lines = fields[0].str.cat(fields[1:], sep="\t")
+    fh.write("\n".join(lines))
+    fh.write("\n")
+
+
+def load_data_batch(conn, df: pd.DataFrame, table: str = "service_requests", upsert: bool = True,
+                    stages: dict | None = None, commit: bool = True) -> None:
+    """Bulk load a chunk via a temporary TSV file and LOAD DATA LOCAL INFILE.
+
+    REPLACE keeps the same idempotency as the upsert path: a reloaded
+    unique_key overwrites the existing row instead of failing. It is used
+    for upsert=False as well: it costs nothing extra for rows that are new,
+    and IGNORE would only add keep-first semantics (LOCAL already reports
+    data conversion problems as warnings either way). See insert_batch for commit.
+    """
+    if df.empty:
+        return
+
+    with timed(stages, "encode"), tempfile.NamedTemporaryFile("w", suffix=".tsv", encoding="utf-8",
+                                                              newline="", delete=False) as tmp:
+        write_tsv_batch(df, tmp)
+        tsv_path = tmp.name
+
+    cols = ",".join(df.columns)
     sql = f"""
-        INSERT INTO service_requests ({cols})
-        VALUES ({placeholders})
-        ON DUPLICATE KEY UPDATE
-          created_date=VALUES(created_date),
-          closed_date=VALUES(closed_date),
-          agency=VALUES(agency),
-          complaint_type=VALUES(complaint_type),
-          descriptor=VALUES(descriptor),
-          borough=VALUES(borough),
-          latitude=VALUES(latitude),
-          longitude=VALUES(longitude)
+        LOAD DATA LOCAL INFILE %s
+        REPLACE INTO TABLE {table}
+        CHARACTER SET utf8mb4
+        FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\'
+        LINES TERMINATED BY '\\n'
+        ({cols})
     """
-    
+
     try:
-        with conn.cursor() as cur:
-            cur.executemany(sql, data)
-        conn.commit()
+        with timed(stages, "insert"), conn.cursor() as cur:
+            cur.execute(sql, (tsv_path,))
+        if commit:
+            with timed(stages, "commit"):
+                conn.commit()
     except Exception as e:
         conn.rollback()
-        print(f"[❌] Batch insert failed (rolled back): {e}")
+        print(f"[❌] LOAD DATA batch failed (rolled back): {e}")
         raise
+    finally:
+        os.remove(tsv_path)
+
+
+def new_load_target(table: str = "service_requests", fresh_window: tuple[str, str] | None = None,
+                    quarantine_dir: str | None = None, clean_cache: dict | None = None,
+                    path: str | None = None) -> dict:
+    """
+    Which file the loaders read, and where and how write_batch stores rows.
+
+    path: the input file (default NYC311_CSV); passed explicitly because
+    SPLIT_WORKERS/PARSE_WORKERS children started with spawn re-import this
+    module and only see the environment's value.
+    fresh_window: [start, end) created_date range verified empty before the
+    load; rows inside it skip the upsert (INSERT_STRATEGY=auto).
+    quarantine_dir: this run's directory for rejected rows (None = off).
+    clean_cache: clean_cache writer receiving every cleaned chunk (None = off).
+    """
+    return {"table": table, "fresh_window": fresh_window, "quarantine_dir": quarantine_dir,
+            "clean_cache": clean_cache, "path": path or CSV_FILENAME}
+
+
+def input_path(target: dict | None) -> str:
+    """The file a load with this target reads."""
+    return (target or new_load_target())["path"]
+
+
+def cache_cleaned_chunk(target: dict | None, chunk_num: int, end_offset: int,
+                        df: pd.DataFrame, stats: dict) -> None:
+    """Store a freshly cleaned chunk in the run's CLEAN_CACHE_DIR entry, if one is being written."""
+    cache = (target or {}).get("clean_cache")
+    if cache is not None:
+        with timed(stats["stage_seconds"], "cache"):
+            store_chunk(cache, chunk_num, end_offset, df, stats)
+
+
+def open_run_quarantine(target: dict | None, part: int = 0) -> dict | None:
+    """Quarantine sink for one writing process of the run (see quarantine.py)."""
+    return open_quarantine((target or {}).get("quarantine_dir"), part)
+
+
+def split_for_target(df: pd.DataFrame, target: dict) -> list[tuple[pd.DataFrame, bool]]:
+    """(rows, upsert) parts of a chunk: rows inside a fresh window need no upsert."""
+    window = target["fresh_window"]
+    if window is None:
+        return [(df, True)]
+    
+    # Rows dated outside the emptied window may collide with existing rows
+    inside = df["created_date"].between(pd.Timestamp(window[0]), pd.Timestamp(window[1]), inclusive="left")
+    return [(df[inside], False), (df[~inside], True)]
+
+
+def write_batch(conn, df: pd.DataFrame, target: dict | None = None, stages: dict | None = None,
+                commit: bool = True) -> None:
+    """Dispatch a cleaned chunk to the configured INGEST_MODE writer."""
+    target = target or new_load_target()
+    writer = load_data_batch if INGEST_MODE == "load_data" else insert_batch
+    if SCHEMA_MODE == "normalized":
+        with timed(stages, "dimensions"):
+            df = encode_dimensions(conn, df, open_connection)
+    for part, upsert in split_for_target(df, target):
+        writer(conn, part, target["table"], upsert=upsert, stages=stages, commit=commit)
 
 
 def run_data_quality_checks(conn):
@@ -253,53 +1023,919 @@ def run_data_quality_checks(conn):
     print("[📊] Hourly complaints sample:", hourly_sample[:3])
 
 
-def ingest_mysql() -> None:
-    """Production-grade NYC 311 ETL with full telemetry."""
-    print(f"[🚀] Starting ETL: {CSV_FILENAME} (BATCH_SIZE={BATCH_SIZE:,})")
-    overall_start = time.time()
+def open_connection():
+    """Open a MySQL connection configured for the current INGEST_MODE."""
+    return pymysql.connect(
+        host=HOST, port=PORT, user=USER, password=PWD,
+        database=DB, charset="utf8mb4", autocommit=False,
+        local_infile=(INGEST_MODE == "load_data")
+    )
+
+
+def session_profile_settings() -> dict:
+    """
+    Session variables the configured SESSION_PROFILE changes.
+
+    With SCHEMA_MODE=normalized unique_checks stays on: the dim_* tables rely
+    on their UNIQUE value column so INSERT IGNORE never assigns a value two ids.
+    """
+    if SESSION_PROFILE != "bulk":
+        return {}
+    if SCHEMA_MODE == "normalized":
+        return {k: v for k, v in BULK_SESSION_SETTINGS.items() if k != "unique_checks"}
+    return BULK_SESSION_SETTINGS
+
+
+def apply_session_profile(conn) -> dict:
+    """
+    Apply SESSION_PROFILE to a connection; return the previous values.
+
+    Settings the account may not change (sql_log_bin without
+    SYSTEM_VARIABLES_ADMIN) are skipped with a warning. Any open transaction
+    (e.g. a checkpoint or empty-window SELECT on the main connection) is
+    committed first: MySQL refuses SET sql_log_bin inside one (error 1694).
+    """
+    saved = {}
+    conn.commit()
+    with conn.cursor() as cur:
+        for name, value in session_profile_settings().items():
+            try:
+                cur.execute(f"SELECT @@SESSION.{name}")
+                previous = cur.fetchone()[0]
+                cur.execute(f"SET SESSION {name} = %s", (value,))
+                saved[name] = previous
+            except pymysql.MySQLError as e:
+                print(f"[⚠] Session profile: cannot set {name} ({e}); leaving it unchanged")
+    return saved
+
+
+def restore_session_settings(conn, saved: dict) -> None:
+    """Undo apply_session_profile() on a connection that outlives the load."""
+    with conn.cursor() as cur:
+        for name, value in saved.items():
+            cur.execute(f"SET SESSION {name} = %s", (value,))
+
+
+def open_load_connection():
+    """Extra writer connection with SESSION_PROFILE applied (closed after the load)."""
+    conn = open_connection()
+    apply_session_profile(conn)
+    return conn
+
+
+def new_load_result(resume: dict | None = None) -> dict:
+    """Accumulator shared by the load strategies below."""
+    first_chunk = resume["chunk"] if resume else 0
+    return {
+        "rows": 0,
+        "chunks": 0,
+        "cleaning_stats": [],
+        "writers": {},
+        "quarantined": 0,
+        # Ordered commit accounting: every chunk <= watermark is committed
+        "committed": set(),
+        "watermark": first_chunk - 1,
+    }
+
+
+def record_commit(result: dict, chunk_num: int) -> None:
+    """Mark a chunk committed and advance the contiguous watermark."""
+    result["committed"].add(chunk_num)
+    while result["watermark"] + 1 in result["committed"]:
+        result["watermark"] += 1
+        result["committed"].discard(result["watermark"])
+
+
+def new_commit_group() -> dict | None:
+    """Open-transaction state for group commit, or None when every chunk commits itself."""
+    if not GROUP_COMMIT:
+        return None
+    return {"chunks": [], "rows": 0, "opened": time.time()}
+
+
+def commit_due(group: dict) -> bool:
+    """Whether the open group has reached COMMIT_EVERY_ROWS rows or COMMIT_EVERY_SECONDS."""
+    return ((COMMIT_EVERY_ROWS > 0 and group["rows"] >= COMMIT_EVERY_ROWS)
+            or (COMMIT_EVERY_SECONDS > 0 and time.time() - group["opened"] >= COMMIT_EVERY_SECONDS))
+
+
+def take_commit_group(group: dict) -> list[int]:
+    """Reset a group right after its commit; return the chunk numbers it made durable."""
+    chunks = group["chunks"]
+    if len(chunks) > 1:
+        print(f"[💾] Group commit: {len(chunks)} chunks, {group['rows']:,} rows "
+              f"({time.time() - group['opened']:.1f}s open)")
+    group.update(chunks=[], rows=0, opened=time.time())
+    return chunks
+
+
+def commit_group(conn, group: dict | None, stages: dict | None = None) -> list[int]:
+    """Commit whatever the group holds (also called once after the last chunk)."""
+    if not group or not group["chunks"]:
+        return []
+    with timed(stages, "commit"):
+        conn.commit()
+    return take_commit_group(group)
+
+
+def finish_chunk(conn, group: dict | None, chunk_num: int, rows: int, stages: dict | None = None) -> list[int]:
+    """
+    Chunks that became durable once this written and checkpointed chunk is done.
+
+    Without group commit that is the chunk itself (its writer committed it);
+    with it, the chunk waits in the open transaction until the group is due.
+    """
+    if group is None:
+        return [chunk_num]
+    group["chunks"].append(chunk_num)
+    group["rows"] += rows
+    return commit_group(conn, group, stages) if commit_due(group) else []
+
+
+def log_chunk_telemetry(chunk_num: int, rows: int, chunk_time: float, writer_id: int | None = None,
+                        stages: dict | None = None) -> None:
+    """Print the per-chunk throughput / resource line (plus its stage breakdown)."""
+    rows_per_sec = rows / chunk_time if chunk_time > 0 else 0
+    mem_mb = psutil.Process().memory_info().rss / 1024**2
+    cpu_pct = psutil.cpu_percent()
+    writer = f" [W{writer_id}]" if writer_id is not None else ""
     
-    conn = pymysql.connect(
+    print(f"[📈] Chunk #{chunk_num+1}{writer}: {rows:,} rows, "
+          f"{rows_per_sec:.0f} r/s, MEM: {mem_mb:.1f}MB, CPU: {cpu_pct:.1f}%"
+          + (f" | {chunk_breakdown(stages)}" if stages else ""))
+
+
+def new_seen_keys() -> dict | None:
+    """unique_key bitmap for drop_seen_keys(), or None when DEDUPE_ACROSS_CHUNKS is off."""
+    return new_key_bitmap() if DEDUPE_ACROSS_CHUNKS else None
+
+
+def drop_seen_keys(seen: dict | None, df: pd.DataFrame, stats: dict, chunk_num: int) -> pd.DataFrame:
+    """
+    Drop rows whose unique_key an earlier chunk already wrote.
+
+    Runs where chunks are written (chunks are cleaned in worker processes), so
+    one bitmap covers the whole file, except with SPLIT_WORKERS: each byte
+    range has its own, and duplicates across ranges are not caught. The
+    count lands in stats["cross_chunk_dupes"] and, when quarantining, the
+    rows are added to stats["rejected"].
+    """
+    if seen is None or df.empty:
+        return df
+    with timed(stats.get("stage_seconds"), "dedupe"):
+        dupes = mark_seen(seen, df["unique_key"].to_numpy(dtype=np.int64))
+    stats["cross_chunk_dupes"] = int(dupes.sum())
+    if not stats["cross_chunk_dupes"]:
+        return df
+    print(f"[🔁] Chunk #{chunk_num+1}: skipped {stats['cross_chunk_dupes']:,} keys seen in earlier chunks")
+    if QUARANTINE_DIR:
+        seen_rows = rejected_rows(df, dupes, "duplicate_across_chunks")
+        stats["rejected"] = pd.concat([r for r in (stats.get("rejected"), seen_rows) if r is not None],
+                                      ignore_index=True)
+    return df[~dupes]
+
+
+def new_batch_sizer() -> dict | None:
+    """State for adapt_batch_size(), or None when ADAPTIVE_BATCH is off."""
+    if not ADAPTIVE_BATCH:
+        return None
+    return {"size": BATCH_SIZE, "bytes_per_row": 0.0, "best_rps": 0.0,
+            "best_size": BATCH_SIZE, "resizes": 0}
+
+
+def batch_size_source(sizer: dict | None):
+    """rows_per_block argument for iter_csv_blocks: fixed, or re-read per block."""
+    return (lambda: sizer["size"]) if sizer else BATCH_SIZE
+
+
+def observe_block(sizer: dict | None, block: bytes) -> None:
+    """Track raw bytes per CSV line, used to project the memory of a larger chunk."""
+    if sizer and block:
+        sizer["bytes_per_row"] = len(block) / max(1, block.count(b"\n"))
+
+
+def adapt_batch_size(sizer: dict | None, rows: int, write_seconds: float) -> None:
+    """
+    Resize the next chunks after one was written.
+
+    Shrink by half when RSS plus a projected chunk would pass MEMORY_CEILING_MB,
+    by a quarter when the insert took well over TARGET_BATCH_SECONDS or when a
+    larger size turned out slower than the best one seen; grow by a quarter
+    while inserts are fast and memory allows. A chunk costs roughly four
+    times its raw bytes in memory (block, parsed frame, encoded statements).
+    The best rows/sec decays slowly so it follows changing server load.
+    """
+    if sizer is None or rows == 0:
+        return
+    size = sizer["size"]
+    rss_mb = psutil.Process().memory_info().rss / 1024**2
+    chunk_mb = 4 * sizer["bytes_per_row"] * size / 1024**2
+    rps = rows / write_seconds if write_seconds > 0 else 0.0
+    
+    sizer["best_rps"] *= 0.98
+    if rps > sizer["best_rps"]:
+        sizer["best_rps"], sizer["best_size"] = rps, size
+    
+    if rss_mb + chunk_mb > MEMORY_CEILING_MB:
+        new_size, reason = size // 2, f"RSS {rss_mb:.0f}MB near {MEMORY_CEILING_MB}MB ceiling"
+    elif write_seconds > 1.5 * TARGET_BATCH_SECONDS:
+        new_size, reason = int(size * 0.75), f"insert took {write_seconds:.2f}s"
+    elif size > sizer["best_size"] and rps < 0.8 * sizer["best_rps"]:
+        new_size, reason = sizer["best_size"], f"{rps:,.0f} r/s below best {sizer['best_rps']:,.0f} r/s"
+    elif write_seconds < TARGET_BATCH_SECONDS and rss_mb + 1.25 * chunk_mb <= MEMORY_CEILING_MB:
+        new_size, reason = int(size * 1.25), f"insert took {write_seconds:.2f}s"
+    else:
+        return
+    
+    new_size = min(BATCH_SIZE_MAX, max(BATCH_SIZE_MIN, new_size))
+    if new_size != size:
+        sizer["size"] = new_size
+        sizer["resizes"] += 1
+        print(f"[🎚] Batch size {size:,} → {new_size:,} ({reason})")
+
+
+def iter_raw_blocks(path: str, resume: dict | None = None, sizer: dict | None = None):
+    """
+    Yield (header, block, end_offset, read_seconds) record blocks of ~BATCH_SIZE
+    rows (or the current adaptive size when a sizer is given).
+
+    end_offset is the byte position right after the block, i.e. where a
+    resumed run has to seek to continue with the next chunk (a position in
+    the decompressed stream for .zip/.gz/.bz2/.zst inputs).
+    """
+    with open_input(path) as fh:
+        header = read_header(fh)
+        offset = len(header)
+        if resume:
+            skip_to(fh, offset, resume["offset"])
+            offset = resume["offset"]
+        for block, read_seconds in iter_timed(iter_csv_blocks(fh, batch_size_source(sizer))):
+            observe_block(sizer, block)
+            offset += len(block)
+            yield header, block, offset, read_seconds
+
+
+def iter_cleaned_chunks(path: str, resume: dict | None = None, sizer: dict | None = None):
+    """Read and clean chunks in the calling thread."""
+    for header, block, end_offset, read_seconds in iter_raw_blocks(path, resume, sizer):
+        yield end_offset, parse_clean_block(header, block, read_seconds)
+
+
+def run_serial_load(conn, resume: dict | None = None, target: dict | None = None) -> dict:
+    """Read, clean and write chunks one after another on a single core."""
+    result = new_load_result(resume)
+    ws = result["writers"].setdefault(0, {"chunks": 0, "rows": 0, "busy_seconds": 0.0})
+    dataset = os.path.basename(input_path(target))
+    first_chunk = result["watermark"] + 1
+    sizer = new_batch_sizer()
+    seen = new_seen_keys()
+    group = new_commit_group()
+    sink = open_run_quarantine(target)
+    
+    try:
+        # Per-chunk telemetry loop
+        for chunk_num, (header, block, end_offset, read_seconds) in enumerate(iter_raw_blocks(input_path(target), resume, sizer),
+                                                                              start=first_chunk):
+            chunk_start = time.time()
+            
+            df, stats = parse_clean_block(header, block, read_seconds)
+            cache_cleaned_chunk(target, chunk_num, end_offset, df, stats)
+            df = drop_seen_keys(seen, df, stats, chunk_num)
+            quarantine_rejects(sink, stats, chunk_num)
+            result["cleaning_stats"].append(stats)
+            
+            if not df.empty:
+                write_start = time.time()
+                write_batch(conn, df, target, stats["stage_seconds"], commit=group is None)
+                write_seconds = time.time() - write_start
+                ws["busy_seconds"] += write_seconds
+                adapt_batch_size(sizer, len(df), write_seconds)
+                ws["rows"] += len(df)
+                ws["chunks"] += 1
+                result["rows"] += len(df)
+                result["chunks"] += 1
+            with timed(stats["stage_seconds"], "checkpoint"):
+                save_checkpoint(conn, dataset, chunk_num, end_offset, len(df), commit=group is None)
+            for done in finish_chunk(conn, group, chunk_num, len(df), stats["stage_seconds"]):
+                record_commit(result, done)
+            
+            if not df.empty:
+                log_chunk_telemetry(chunk_num, len(df), time.time() - chunk_start, stages=stats["stage_seconds"])
+        
+        for done in commit_group(conn, group):
+            record_commit(result, done)
+    finally:
+        result["quarantined"] = close_quarantine(sink)
+    return result
+
+
+def run_writer_pool(conn, items, resume: dict | None = None, target: dict | None = None,
+                    sizer: dict | None = None) -> dict:
+    """
+    Drain cleaned chunks into MySQL with WRITER_CONNECTIONS concurrent writers.
+
+    `items` yields (end_offset, work) where work is either a (df, stats)
+    tuple or a Future resolving to one; every chunk is checkpointed by the
+    writer that committed it.
+    They pass through a bounded queue (PIPELINE_DEPTH) so a slow database
+    back-pressures the producer instead of buffering the file. With a single
+    writer the shared `conn` is used and chunks commit in file order; with
+    several, each writer owns a connection and commits independently (so a
+    unique_key duplicated across chunks may resolve to either copy), and
+    the first failure stops every writer before the run is logged.
+    With group commit each writer keeps its own open transaction; the
+    groups of writers that did not fail are still committed on abort.
+    `sizer` (shared with the reader producing `items`) is adapted after
+    every write.
+    """
+    result = new_load_result(resume)
+    dataset = os.path.basename(input_path(target))
+    first_chunk = result["watermark"] + 1
+    pending: queue.Queue = queue.Queue(maxsize=PIPELINE_DEPTH)
+    lock = threading.Lock()
+    abort = threading.Event()
+    errors = []
+    seen = new_seen_keys()
+    sink = open_run_quarantine(target)
+    
+    if WRITER_CONNECTIONS > 1:
+        connections = [open_load_connection() for _ in range(WRITER_CONNECTIONS)]
+    else:
+        connections = [conn]
+    
+    def writer(writer_id: int, wconn):
+        ws = {"chunks": 0, "rows": 0, "busy_seconds": 0.0}
+        group = new_commit_group()
+        with lock:
+            result["writers"][writer_id] = ws
+        while True:
+            item = pending.get()
+            if item is None:
+                break
+            chunk_num, end_offset, work = item
+            if abort.is_set():
+                if isinstance(work, Future):
+                    work.cancel()
+                continue
+            try:
+                chunk_start = time.time()
+                df, stats = work.result() if isinstance(work, Future) else work
+                cache_cleaned_chunk(target, chunk_num, end_offset, df, stats)
+                with lock:
+                    df = drop_seen_keys(seen, df, stats, chunk_num)
+                    quarantine_rejects(sink, stats, chunk_num)
+                if not df.empty:
+                    write_start = time.time()
+                    write_batch(wconn, df, target, stats["stage_seconds"], commit=group is None)
+                    write_seconds = time.time() - write_start
+                    ws["busy_seconds"] += write_seconds
+                    with lock:
+                        adapt_batch_size(sizer, len(df), write_seconds)
+                    ws["rows"] += len(df)
+                    ws["chunks"] += 1
+                with timed(stats["stage_seconds"], "checkpoint"):
+                    save_checkpoint(wconn, dataset, chunk_num, end_offset, len(df), commit=group is None)
+                done = finish_chunk(wconn, group, chunk_num, len(df), stats["stage_seconds"])
+                with lock:
+                    result["cleaning_stats"].append(stats)
+                    result["rows"] += len(df)
+                    result["chunks"] += 0 if df.empty else 1
+                    for committed in done:
+                        record_commit(result, committed)
+                if not df.empty:
+                    log_chunk_telemetry(chunk_num, len(df), time.time() - chunk_start,
+                                        writer_id if len(connections) > 1 else None, stats["stage_seconds"])
+            except Exception as e:
+                with lock:
+                    errors.append(e)
+                abort.set()
+                print(f"[❌] Writer W{writer_id} failed on chunk #{chunk_num+1}; aborting run")
+                if group:
+                    wconn.rollback()  # the open group goes with the failed chunk
+                    group.update(chunks=[], rows=0)
+        try:
+            done = commit_group(wconn, group)
+        except Exception as e:
+            with lock:
+                errors.append(e)
+            abort.set()
+            print(f"[❌] Writer W{writer_id} failed on its final commit")
+            return
+        with lock:
+            for committed in done:
+                record_commit(result, committed)
+    
+    threads = [
+        threading.Thread(target=writer, args=(i, c), name=f"mysql-writer-{i}")
+        for i, c in enumerate(connections)
+    ]
+    for t in threads:
+        t.start()
+    
+    try:
+        for chunk_num, (end_offset, work) in enumerate(items, start=first_chunk):
+            if abort.is_set():
+                break
+            pending.put((chunk_num, end_offset, work))
+    finally:
+        for _ in threads:
+            pending.put(None)
+        for t in threads:
+            t.join()
+        if len(connections) > 1:
+            for c in connections:
+                c.close()
+        result["quarantined"] = close_quarantine(sink)
+    
+    if errors:
+        print(f"[⚠] Chunks committed contiguously through #{result['watermark']+1} "
+              f"({len(result['committed'])} more committed out of order)")
+        raise errors[0]
+    
+    return result
+
+
+def run_parallel_load(conn, resume: dict | None = None, target: dict | None = None) -> dict:
+    """
+    Feed the writer pool from either the main thread or a parse/clean process pool.
+
+    With PARSE_WORKERS > 1 the CSV is split into raw record blocks which are
+    parsed and cleaned by worker processes while the writers insert.
+    """
+    print(f"[⚙️] Parallel mode: {PARSE_WORKERS} parse workers, "
+          f"{WRITER_CONNECTIONS} writer connections, queue depth {PIPELINE_DEPTH}")
+    sizer = new_batch_sizer()
+    if PARSE_WORKERS <= 1:
+        return run_writer_pool(conn, iter_cleaned_chunks(input_path(target), resume, sizer), resume, target, sizer)
+    
+    with ProcessPoolExecutor(max_workers=PARSE_WORKERS) as pool:
+        futures = ((end_offset, pool.submit(parse_clean_block, header, block, read_seconds))
+                   for header, block, end_offset, read_seconds in iter_raw_blocks(input_path(target), resume, sizer))
+        return run_writer_pool(conn, futures, resume, target, sizer)
+
+
+def run_cached_load(conn, manifest: dict, start: int, resume: dict | None = None,
+                    target: dict | None = None) -> dict:
+    """
+    Replay cleaned chunks from a CLEAN_CACHE_DIR entry into the writer pool.
+
+    No CSV parsing or cleaning: Parquet files are read in the main thread
+    while WRITER_CONNECTIONS writers insert, so the load is bound by MySQL.
+    A partial entry (left by a failed load) only covers a prefix of the
+    file: after it, the CSV is read from the prefix's end offset on, parsed
+    by PARSE_WORKERS like run_parallel_load, and cleaned chunks are added to
+    the entry.
+    """
+    chunks = manifest["chunks"]
+    print(f"[🗃] Replaying {len(chunks) - start} cleaned chunks from {manifest['path']} "
+          f"({WRITER_CONNECTIONS} writer connections)")
+    replay = iter_cached_chunks(manifest, start)
+    if manifest["complete"]:
+        return run_writer_pool(conn, replay, resume, target)
+    
+    tail = {"chunk": len(chunks), "offset": chunks[-1]["end_offset"], "rows": 0}
+    print(f"[🗃] Partial entry: reading the CSV from chunk #{tail['chunk']+1} "
+          f"(byte {tail['offset']:,}) on")
+    sizer = new_batch_sizer()
+    if PARSE_WORKERS <= 1:
+        items = itertools.chain(replay, iter_cleaned_chunks(input_path(target), tail, sizer))
+        return run_writer_pool(conn, items, resume, target, sizer)
+    
+    with ProcessPoolExecutor(max_workers=PARSE_WORKERS) as pool:
+        futures = ((end_offset, pool.submit(parse_clean_block, header, block, read_seconds))
+                   for header, block, end_offset, read_seconds in iter_raw_blocks(input_path(target), tail, sizer))
+        return run_writer_pool(conn, itertools.chain(replay, futures), resume, target, sizer)
+
+
+def ingest_byte_range(range_id: int, header: bytes, start: int, end: int,
+                      target: dict | None = None) -> dict:
+    """Worker entry point: read, clean and insert one byte range on its own connection."""
+    ws = {"chunks": 0, "rows": 0, "busy_seconds": 0.0, "cleaning_stats": [], "quarantined": 0}
+    sizer = new_batch_sizer()
+    seen = new_seen_keys()
+    group = new_commit_group()
+    sink = open_run_quarantine(target, range_id)
+    conn = open_load_connection()
+    try:
+        with open(input_path(target), "rb") as fh:
+            blocks = iter_csv_blocks(iter_range_lines(fh, start, end), batch_size_source(sizer))
+            for chunk_num, (block, read_seconds) in enumerate(iter_timed(blocks)):
+                observe_block(sizer, block)
+                chunk_start = time.time()
+                df, stats = parse_clean_block(header, block, read_seconds)
+                df = drop_seen_keys(seen, df, stats, chunk_num)
+                quarantine_rejects(sink, stats, chunk_num)
+                ws["cleaning_stats"].append(stats)
+                if df.empty:
+                    continue
+                
+                write_start = time.time()
+                write_batch(conn, df, target, stats["stage_seconds"], commit=group is None)
+                write_seconds = time.time() - write_start
+                ws["busy_seconds"] += write_seconds
+                adapt_batch_size(sizer, len(df), write_seconds)
+                ws["rows"] += len(df)
+                ws["chunks"] += 1
+                finish_chunk(conn, group, chunk_num, len(df), stats["stage_seconds"])
+                
+                log_chunk_telemetry(chunk_num, len(df), time.time() - chunk_start, range_id,
+                                    stats["stage_seconds"])
+            commit_group(conn, group)
+    finally:
+        conn.close()
+        ws["quarantined"] = close_quarantine(sink)
+    return ws
+
+
+def run_split_load(target: dict | None = None) -> dict:
+    """
+    Ingest the CSV as SPLIT_WORKERS independent byte ranges in parallel.
+
+    Each process seeks to its own record-aligned slice of the file, so there
+    is no single reader to bottleneck on. Ranges finish in any order, so a
+    unique_key duplicated across ranges may resolve to either copy.
+    """
+    header, ranges = compute_byte_ranges(input_path(target), SPLIT_WORKERS)
+    print(f"[✂️] Split mode: {len(ranges)} byte ranges across {SPLIT_WORKERS} workers")
+    result = new_load_result()
+    errors = []
+    
+    with ProcessPoolExecutor(max_workers=SPLIT_WORKERS) as pool:
+        futures = {
+            pool.submit(ingest_byte_range, range_id, header, start, end, target): range_id
+            for range_id, (start, end) in enumerate(ranges)
+        }
+        for future, range_id in futures.items():
+            try:
+                ws = future.result()
+            except Exception as e:
+                print(f"[❌] Range R{range_id} failed: {e}")
+                errors.append(e)
+                for other in futures:
+                    other.cancel()
+                continue
+            result["cleaning_stats"].extend(ws.pop("cleaning_stats"))
+            result["quarantined"] += ws.pop("quarantined")
+            result["writers"][range_id] = ws
+            result["rows"] += ws["rows"]
+            result["chunks"] += ws["chunks"]
+    
+    if errors:
+        raise errors[0]
+    
+    return result
+
+
+async def open_async_connection():
+    """aiomysql counterpart of open_load_connection(), priming statement_limit()'s cache."""
+    aconn = await aiomysql.connect(
         host=HOST, port=PORT, user=USER, password=PWD,
-        database=DB, charset="utf8mb4", autocommit=False
+        db=DB, charset="utf8mb4", autocommit=False
     )
+    async with aconn.cursor() as cur:
+        for name, value in session_profile_settings().items():
+            try:
+                await cur.execute(f"SET SESSION {name} = %s", (value,))
+            except pymysql.MySQLError as e:
+                print(f"[⚠] Session profile: cannot set {name} ({e}); leaving it unchanged")
+    key = (aconn.host, aconn.port)
+    if key not in _STATEMENT_LIMITS:
+        async with aconn.cursor() as cur:
+            await cur.execute("SELECT @@max_allowed_packet")
+            max_packet = int((await cur.fetchone())[0])
+        _STATEMENT_LIMITS[key] = min(MAX_STATEMENT_BYTES, max_packet - 1024)
+    return aconn
+
+
+async def write_batch_async(aconn, df: pd.DataFrame, target: dict | None = None,
+                            stages: dict | None = None, commit: bool = True) -> None:
+    """write_batch() over aiomysql: multi-row INSERTs, one commit per chunk (unless commit=False)."""
+    target = target or new_load_target()
+    max_bytes = _STATEMENT_LIMITS[(aconn.host, aconn.port)]
+    try:
+        async with aconn.cursor() as cur:
+            for part, upsert in split_for_target(df, target):
+                if part.empty:
+                    continue
+                with timed(stages, "encode"):
+                    statements = build_insert_statements(part, target["table"], upsert, max_bytes)
+                with timed(stages, "insert"):
+                    for sql in statements:
+                        await cur.execute(sql)
+        if commit:
+            with timed(stages, "commit"):
+                await aconn.commit()
+    except Exception as e:
+        await aconn.rollback()
+        print(f"[❌] Batch insert failed (rolled back): {e}")
+        raise
+
+
+async def save_checkpoint_async(aconn, filename: str, chunk_index: int, byte_offset: int, rows: int,
+                                commit: bool = True) -> None:
+    async with aconn.cursor() as cur:
+        await cur.execute(CHECKPOINT_SQL, (filename, chunk_index, byte_offset, rows))
+    if commit:
+        await aconn.commit()
+
+
+async def commit_group_async(aconn, group: dict | None, stages: dict | None = None) -> list[int]:
+    """commit_group() over aiomysql."""
+    if not group or not group["chunks"]:
+        return []
+    with timed(stages, "commit"):
+        await aconn.commit()
+    return take_commit_group(group)
+
+
+async def run_async_load(resume: dict | None = None, target: dict | None = None) -> dict:
+    """
+    asyncio pipeline: read and clean in executors while aiomysql writers commit.
+
+    One thread reads raw blocks, parse/clean runs in a thread (or a process
+    pool with PARSE_WORKERS > 1), and WRITER_CONNECTIONS coroutines insert
+    over aiomysql. While a writer awaits MySQL the event loop keeps reading
+    and cleaning; at most PIPELINE_DEPTH cleaned chunks wait in the queue.
+    """
+    loop = asyncio.get_running_loop()
+    result = new_load_result(resume)
+    dataset = os.path.basename(input_path(target))
+    first_chunk = result["watermark"] + 1
+    sizer = new_batch_sizer()
+    seen = new_seen_keys()
+    sink = open_run_quarantine(target)
+    pending: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_DEPTH)
+    busy = {"read": 0.0, "clean": 0.0}
+    n_writers = max(1, WRITER_CONNECTIONS)
+    print(f"[⚡] Async pipeline: {PARSE_WORKERS} clean workers, {n_writers} aiomysql writers, "
+          f"{PIPELINE_DEPTH} chunks in flight")
+    
+    async def clean(header: bytes, block: bytes, read_seconds: float, cleaner):
+        start = time.time()
+        cleaned = await loop.run_in_executor(cleaner, parse_clean_block, header, block, read_seconds)
+        busy["clean"] += time.time() - start
+        return cleaned
+    
+    async def reader(read_pool, cleaner):
+        blocks = iter_raw_blocks(input_path(target), resume, sizer)
+        chunk_num = first_chunk
+        while True:
+            start = time.time()
+            item = await loop.run_in_executor(read_pool, next, blocks, None)
+            busy["read"] += time.time() - start
+            if item is None:
+                break
+            header, block, end_offset, read_seconds = item
+            task = asyncio.ensure_future(clean(header, block, read_seconds, cleaner))
+            await pending.put((chunk_num, end_offset, task))
+            print(f"[📥] Chunk #{chunk_num+1} read ({len(block) / 1024**2:.1f}MB), "
+                  f"{pending.qsize()} waiting for writers")
+            chunk_num += 1
+        for _ in range(n_writers):
+            await pending.put(None)
+    
+    async def writer(writer_id: int, aconn):
+        ws = result["writers"].setdefault(writer_id, {"chunks": 0, "rows": 0, "busy_seconds": 0.0})
+        group = new_commit_group()
+        while True:
+            item = await pending.get()
+            if item is None:
+                for done in await commit_group_async(aconn, group):
+                    record_commit(result, done)
+                return
+            chunk_num, end_offset, task = item
+            chunk_start = time.time()
+            df, stats = await task
+            cache_cleaned_chunk(target, chunk_num, end_offset, df, stats)
+            df = drop_seen_keys(seen, df, stats, chunk_num)
+            quarantine_rejects(sink, stats, chunk_num)
+            result["cleaning_stats"].append(stats)
+            if not df.empty:
+                write_start = time.time()
+                await write_batch_async(aconn, df, target, stats["stage_seconds"], commit=group is None)
+                write_seconds = time.time() - write_start
+                ws["busy_seconds"] += write_seconds
+                adapt_batch_size(sizer, len(df), write_seconds)
+                ws["rows"] += len(df)
+                ws["chunks"] += 1
+                result["rows"] += len(df)
+                result["chunks"] += 1
+            with timed(stats["stage_seconds"], "checkpoint"):
+                await save_checkpoint_async(aconn, dataset, chunk_num, end_offset, len(df),
+                                            commit=group is None)
+            if group is None:
+                record_commit(result, chunk_num)
+            else:
+                group["chunks"].append(chunk_num)
+                group["rows"] += len(df)
+                if commit_due(group):
+                    for done in await commit_group_async(aconn, group, stats["stage_seconds"]):
+                        record_commit(result, done)
+            if not df.empty:
+                log_chunk_telemetry(chunk_num, len(df), time.time() - chunk_start,
+                                    writer_id if n_writers > 1 else None, stats["stage_seconds"])
+    
+    wall_start = time.time()
+    connections = [await open_async_connection() for _ in range(n_writers)]
+    cleaner = ProcessPoolExecutor(max_workers=PARSE_WORKERS) if PARSE_WORKERS > 1 else ThreadPoolExecutor(1)
+    read_pool = ThreadPoolExecutor(1, thread_name_prefix="csv-reader")
+    tasks = [asyncio.ensure_future(reader(read_pool, cleaner))]
+    tasks += [asyncio.ensure_future(writer(i, c)) for i, c in enumerate(connections)]
+    try:
+        await asyncio.gather(*tasks)
+    except Exception:
+        for t in tasks:
+            t.cancel()
+        print(f"[⚠] Chunks committed contiguously through #{result['watermark']+1}")
+        raise
+    finally:
+        read_pool.shutdown(cancel_futures=True)
+        cleaner.shutdown(cancel_futures=True)
+        for c in connections:
+            c.close()
+        result["quarantined"] = close_quarantine(sink)
+    
+    # Overlap: read + clean + write busy time packed into less wall-clock time
+    wall = time.time() - wall_start
+    write_busy = sum(ws["busy_seconds"] for ws in result["writers"].values())
+    print(f"[⚡] Async busy time: read {busy['read']:.1f}s, clean {busy['clean']:.1f}s, "
+          f"write {write_busy:.1f}s in {wall:.1f}s wall")
+    return result
+
+
+def validate_config() -> None:
+    """Reject unknown or incompatible settings before anything touches MySQL."""
+    if INGEST_MODE not in INGEST_MODES:
+        raise ValueError(f"Unknown INGEST_MODE={INGEST_MODE!r} (expected one of {INGEST_MODES})")
+    if CSV_READER not in CSV_READERS:
+        raise ValueError(f"Unknown CSV_READER={CSV_READER!r} (expected one of {CSV_READERS})")
+    if DATE_PARSER not in DATE_PARSERS:
+        raise ValueError(f"Unknown DATE_PARSER={DATE_PARSER!r} (expected one of {DATE_PARSERS})")
+    if CSV_READER == "arrow" and pa_csv is None:
+        raise RuntimeError("CSV_READER=arrow requires pyarrow (pip install pyarrow)")
+    if RELOAD_STRATEGY not in RELOAD_STRATEGIES:
+        raise ValueError(f"Unknown RELOAD_STRATEGY={RELOAD_STRATEGY!r} (expected one of {RELOAD_STRATEGIES})")
+    if FINGERPRINT_MODE not in FINGERPRINT_MODES + ("off",):
+        raise ValueError(f"Unknown FINGERPRINT_MODE={FINGERPRINT_MODE!r} (expected one of {FINGERPRINT_MODES + ('off',)})")
+    if INSERT_STRATEGY not in INSERT_STRATEGIES:
+        raise ValueError(f"Unknown INSERT_STRATEGY={INSERT_STRATEGY!r} (expected one of {INSERT_STRATEGIES})")
+    if ADAPTIVE_BATCH and not BATCH_SIZE_MIN <= BATCH_SIZE <= BATCH_SIZE_MAX:
+        raise ValueError(f"BATCH_SIZE={BATCH_SIZE} outside [BATCH_SIZE_MIN={BATCH_SIZE_MIN}, BATCH_SIZE_MAX={BATCH_SIZE_MAX}]")
+    if SESSION_PROFILE not in SESSION_PROFILES:
+        raise ValueError(f"Unknown SESSION_PROFILE={SESSION_PROFILE!r} (expected one of {SESSION_PROFILES})")
+    if SCHEMA_MODE not in SCHEMA_MODES:
+        raise ValueError(f"Unknown SCHEMA_MODE={SCHEMA_MODE!r} (expected one of {SCHEMA_MODES})")
+    if SCHEMA_MODE == "normalized" and (RELOAD_STRATEGY == "exchange" or DEFER_INDEXES or ASYNC_PIPELINE):
+        raise ValueError("SCHEMA_MODE=normalized supports RELOAD_STRATEGY=delete without DEFER_INDEXES/ASYNC_PIPELINE")
+    if ASYNC_PIPELINE:
+        if aiomysql is None:
+            raise RuntimeError("ASYNC_PIPELINE=true requires `pip install aiomysql`")
+        if INGEST_MODE != "upsert" or SPLIT_WORKERS > 1:
+            raise ValueError("ASYNC_PIPELINE supports INGEST_MODE=upsert without SPLIT_WORKERS")
+    if COMMIT_EVERY_ROWS < 0 or COMMIT_EVERY_SECONDS < 0:
+        raise ValueError("COMMIT_EVERY_ROWS and COMMIT_EVERY_SECONDS must be >= 0 (0 = off)")
+    if CLEAN_CACHE_DIR and (pa is None or FINGERPRINT_MODE == "off"):
+        raise ValueError("CLEAN_CACHE_DIR needs pyarrow and a content fingerprint (FINGERPRINT_MODE=sample|full)")
+    if QUARANTINE_DIR and pa is None:
+        raise RuntimeError("QUARANTINE_DIR requires pyarrow (pip install pyarrow)")
+    if FILE_WORKERS > 1 and DEFER_INDEXES:
+        raise ValueError("DEFER_INDEXES drops indexes other files are still loading into; use FILE_WORKERS=1")
+    if RESUME and SPLIT_WORKERS > 1:
+        raise ValueError("RESUME is not supported with SPLIT_WORKERS > 1 (byte ranges are not checkpointed)")
+
+
+def ingest_file(path: str) -> dict:
+    """
+    Production-grade NYC 311 ETL with full telemetry, for one input file.
+
+    Returns {"file", "status" ("loaded" | "skipped"), "rows", "elapsed"}.
+    """
+    name = os.path.basename(path)
+    if SPLIT_WORKERS > 1 and is_compressed(path):
+        raise ValueError("SPLIT_WORKERS needs random access; use PARSE_WORKERS for compressed inputs")
+
+    print(f"[🚀] Starting ETL: {path} (BATCH_SIZE={BATCH_SIZE:,}{' adaptive' if ADAPTIVE_BATCH else ''}, "
+          f"MODE={INGEST_MODE})")
+    if GROUP_COMMIT:
+        print(f"[💾] Group commit every {COMMIT_EVERY_ROWS or '∞'} rows / {COMMIT_EVERY_SECONDS or '∞'}s")
+    overall_start = time.time()
+    
+    conn = open_connection()
+    restore_on_failure = set()  # indexes dropped from the live table by DEFER_INDEXES
     
     try:
         # STEP 1: Ensure logging infrastructure exists
         create_ingestion_log_table(conn)
+        create_checkpoint_table(conn)
         
         # STEP 2: Idempotency check
-        if log_ingestion_start(conn, os.path.basename(CSV_FILENAME)):
-            return
+        fingerprint = None
+        if FINGERPRINT_MODE != "off":
+            fp_start = time.time()
+            fingerprint = fingerprint_file(path, FINGERPRINT_MODE)
+            print(f"[🔑] Fingerprint {fingerprint} ({time.time() - fp_start:.2f}s)")
+        if log_ingestion_start(conn, name, fingerprint, path):
+            return {"file": name, "status": "skipped", "rows": 0,
+                    "elapsed": time.time() - overall_start}
         
-        # STEP 3: Cleanup previous data for this file
-        cleanup_previous_data(conn, os.path.basename(CSV_FILENAME))
+        # STEP 3: Resume from the last checkpoint, or cleanup previous data for this file
+        exchange = RELOAD_STRATEGY == "exchange"
+        if exchange:
+            if not get_year_partitions(conn):
+                raise RuntimeError("RELOAD_STRATEGY=exchange needs sql/002_partition_service_requests.sql applied")
+            window = parse_date_range_from_filename(name)  # fail fast without a year
+            if not (window[0].endswith("-01-01") and window[1].endswith("-01-01")):
+                raise ValueError("RELOAD_STRATEGY=exchange swaps whole years; it needs one file per year")
+            # Create (or reject) the year's partition before the staging load, not after it
+            ensure_year_partition(conn, int(window[0][:4]))
+        staging = staging_table_name(name) if exchange else None
+        table = staging if exchange else FACT_TABLE if SCHEMA_MODE == "normalized" else "service_requests"
         
-        total_rows = 0
-        total_chunks = 0
-        cleaning_stats = []
+        resume = load_checkpoint(conn, name) if RESUME else None
+        if resume:
+            print(f"[⏯] Resuming at chunk #{resume['chunk']+1} (byte {resume['offset']:,}, "
+                  f"{resume['rows']:,} rows already committed); skipping cleanup")
+            clear_checkpoints(conn, name, resume["chunk"])
+            conn.commit()
+            if exchange:
+                prepare_staging_table(conn, staging, reset=False)
+        else:
+            clear_checkpoints(conn, name)
+            if exchange:
+                prepare_staging_table(conn, staging)
+            else:
+                cleanup_previous_data(conn, name, table)
         
-        # Per-chunk telemetry loop
-        for chunk_num, chunk in enumerate(pd.read_csv(CSV_FILENAME, chunksize=BATCH_SIZE)):
-            chunk_start = time.time()
-            
-            df, stats = clean_chunk(chunk)
-            cleaning_stats.append(stats)
-            
-            if df.empty:
-                continue
-            
-            insert_batch(conn, df)
-            total_rows += len(df)
-            total_chunks += 1
-            
-            # Per-chunk telemetry
-            chunk_time = time.time() - chunk_start
-            rows_per_sec = len(df) / chunk_time if chunk_time > 0 else 0
-            mem_mb = psutil.Process().memory_info().rss / 1024**2
-            cpu_pct = psutil.cpu_percent()
-            
-            print(f"[📈] Chunk #{chunk_num+1}: {len(df):,} rows, "
-                  f"{rows_per_sec:.0f} r/s, MEM: {mem_mb:.1f}MB, CPU: {cpu_pct:.1f}%")
+        # One quarantine directory per run (resumed runs start a new one)
+        quarantine_dir = None
+        if QUARANTINE_DIR:
+            stem = name.split(".")[0]
+            quarantine_dir = os.path.join(QUARANTINE_DIR, f"{stem}-{time.strftime('%Y%m%dT%H%M%S')}")
+        
+        # Fast path: plain inserts while the (just emptied) window has no rows
+        target = new_load_target(table, quarantine_dir=quarantine_dir, path=path)
+        if INSERT_STRATEGY == "auto" and not resume:
+            try:
+                window = parse_date_range_from_filename(name)
+            except ValueError:
+                window = None
+            if window and is_window_empty(conn, table, *window):
+                target["fresh_window"] = window
+                print(f"[⚡] Window {window[0]} → {window[1]} is empty: using plain INSERTs")
+            else:
+                print("[ℹ] Window not empty (or no year in filename): using upserts")
+        
+        # Cleaned-chunk cache: replay a complete entry (or the prefix a failed
+        # load left and extend it), or build one while loading the CSV
+        manifest = cache_start = None
+        if CLEAN_CACHE_DIR:
+            entry = cache_path(CLEAN_CACHE_DIR, fingerprint, CLEANING_VERSION,
+                               "keepfirst" if DUPLICATE_KEEP == "first" else "")
+            manifest = load_manifest(entry)
+            cache_start = resume_position(manifest, resume) if manifest else None
+            if manifest and cache_start is None:
+                print("[ℹ] Clean cache: resume point is not a cached chunk boundary; reading the CSV")
+            elif manifest and not manifest["complete"]:
+                target["clean_cache"] = open_cache_writer(entry, manifest)
+            elif not manifest and not resume and SPLIT_WORKERS <= 1:
+                target["clean_cache"] = open_cache_writer(entry)
+                print(f"[🗃] Clean cache: no entry for this content yet, building {entry}")
+        
+        # Indexes to restore: for an exchange the staging table must match
+        # service_requests exactly; a direct load restores what it dropped
+        # (also if the load fails, so the live table is never left unindexed)
+        if DEFER_INDEXES:
+            dropped = drop_secondary_indexes(conn, table)
+            deferred = get_secondary_indexes(conn, "service_requests") if exchange else dropped
+            if not exchange:
+                restore_on_failure = deferred
+        
+        session_saved = apply_session_profile(conn)
+        if session_saved:
+            print(f"[🏎] Session profile {SESSION_PROFILE}: " + ", ".join(
+                f"{setting}={session_profile_settings()[setting]}" for setting in session_saved))
+        load_start = time.time()
+        if cache_start is not None:
+            result = run_cached_load(conn, manifest, cache_start, resume, target)
+        elif ASYNC_PIPELINE:
+            result = asyncio.run(run_async_load(resume, target))
+        elif SPLIT_WORKERS > 1:
+            result = run_split_load(target)
+        elif PARSE_WORKERS > 1 or WRITER_CONNECTIONS > 1:
+            result = run_parallel_load(conn, resume, target)
+        else:
+            result = run_serial_load(conn, resume, target)
+        load_seconds = time.time() - load_start
+        restore_session_settings(conn, session_saved)
+        finish_cache(target["clean_cache"])
+        
+        index_seconds = rebuild_secondary_indexes(conn, table, deferred) if DEFER_INDEXES else None
+        
+        if exchange:
+            exchange_year_partition(conn, name, staging)
+        total_rows, total_chunks = result["rows"], result["chunks"]
+        if resume:
+            total_rows += resume["rows"]
         
         # Final telemetry
         elapsed = time.time() - overall_start
@@ -307,19 +1943,51 @@ def ingest_mysql() -> None:
         final_mem = psutil.Process().memory_info().rss / 1024**2
         
         print(f"\n[✅] ETL COMPLETE:")
-        print(f"   {total_rows:,} rows in {total_chunks} chunks, {elapsed:.1f}s ({overall_rps:.0f} r/s)")
+        print(f"   {total_rows:,} rows in {total_chunks} chunks, {elapsed:.1f}s ({overall_rps:.0f} r/s, mode={INGEST_MODE})")
         print(f"   Peak RAM: {final_mem:.1f} MB")
+        rejected = {reason: sum(s.get(counter, 0) for s in result["cleaning_stats"])
+                    for reason, counter in REJECT_REASONS.items()}
+        print("   Rejected: " + ", ".join(f"{reason} {n:,}" for reason, n in rejected.items()))
+        if quarantine_dir:
+            print(f"   Quarantined {result['quarantined']:,} rows under {quarantine_dir}")
+        if index_seconds is not None:
+            print(f"   Row load: {load_seconds:.1f}s, index build: {index_seconds:.1f}s")
+        for writer_id, ws in sorted(result["writers"].items()):
+            wrps = ws["rows"] / ws["busy_seconds"] if ws["busy_seconds"] > 0 else 0
+            print(f"   Writer W{writer_id}: {ws['rows']:,} rows in {ws['chunks']} chunks "
+                  f"({wrps:.0f} r/s while writing)")
+        
+        stage_summary = summarize_stages([s["stage_seconds"] for s in result["cleaning_stats"]])
+        print(f"   {'Stage':<22}{'total':>9}{'p50':>9}{'p95':>9}{'max':>9}  (seconds per chunk)")
+        for stage, st in stage_summary.items():
+            print(f"   {stage:<22}{st['total']:>9.2f}{st['p50']:>9.3f}{st['p95']:>9.3f}{st['max']:>9.3f}")
         
         # Log to ingestion_log table
         with conn.cursor() as cur:
             cur.execute("""
-                INSERT INTO ingestion_log (dataset_file, ingested_rows, elapsed_seconds, rows_per_sec)
-                VALUES (%s, %s, %s, %s)
+                INSERT INTO ingestion_log
+                    (dataset_file, ingested_rows, elapsed_seconds, rows_per_sec,
+                     ingest_mode, writer_connections, load_seconds, index_build_seconds,
+                     content_fingerprint, session_profile, rejected_rows, quarantine_dir)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                 ON DUPLICATE KEY UPDATE
                     ingested_rows=VALUES(ingested_rows),
                     elapsed_seconds=VALUES(elapsed_seconds),
-                    rows_per_sec=VALUES(rows_per_sec)
-            """, (os.path.basename(CSV_FILENAME), total_rows, elapsed, overall_rps))
+                    rows_per_sec=VALUES(rows_per_sec),
+                    ingest_mode=VALUES(ingest_mode),
+                    writer_connections=VALUES(writer_connections),
+                    load_seconds=VALUES(load_seconds),
+                    index_build_seconds=VALUES(index_build_seconds),
+                    content_fingerprint=VALUES(content_fingerprint),
+                    session_profile=VALUES(session_profile),
+                    rejected_rows=VALUES(rejected_rows),
+                    quarantine_dir=VALUES(quarantine_dir)
+            """, (name, total_rows, elapsed, overall_rps,
+                  INGEST_MODE, len(result["writers"]), load_seconds, index_seconds,
+                  fingerprint, SESSION_PROFILE, sum(rejected.values()), quarantine_dir))
+        log_writer_stats(conn, name, result["writers"])
+        log_stage_stats(conn, name, stage_summary)
+        clear_checkpoints(conn, name)
         
         # Data quality validation
         run_data_quality_checks(conn)
@@ -329,9 +1997,123 @@ def ingest_mysql() -> None:
     except Exception as e:
         conn.rollback()
         print(f"[💥] ETL FAILED (full rollback): {e}")
+        if restore_on_failure:
+            try:
+                rebuild_secondary_indexes(conn, table, restore_on_failure)
+            except Exception as index_error:
+                print(f"[⚠] Could not rebuild {', '.join(sorted(restore_on_failure))} on {table} "
+                      f"(apply sql/003 by hand): {index_error}")
+        print("[ℹ] Committed chunks are checkpointed; re-run with RESUME=true to continue")
         raise
     finally:
         conn.close()
+    
+    return {"file": name, "status": "loaded", "rows": total_rows, "elapsed": elapsed}
+
+
+def resolve_input_files(spec: str) -> list[str]:
+    """
+    Files named by NYC311_CSV: a single file, every CSV (plain or compressed)
+    in a directory, or a glob pattern. Largest first, so the longest loads
+    start earliest.
+    """
+    if os.path.isdir(spec):
+        paths = [os.path.join(spec, name) for name in os.listdir(spec)
+                 if name.lower().endswith((".csv",) + COMPRESSED_SUFFIXES)]
+    elif any(c in spec for c in "*?["):
+        paths = glob.glob(spec, recursive=True)
+    else:
+        return [spec]
+    
+    paths = sorted((p for p in paths if os.path.isfile(p)), key=os.path.getsize, reverse=True)
+    if not paths:
+        raise FileNotFoundError(f"No input files match NYC311_CSV={spec}")
+    names = [os.path.basename(p) for p in paths]
+    clashes = sorted({n for n in names if names.count(n) > 1})
+    if clashes:
+        raise ValueError(f"Input files need distinct names (they key ingestion_log): {clashes}")
+    return paths
+
+
+def check_window_overlaps(paths: list[str]) -> None:
+    """
+    Refuse batches where two files clean up overlapping date windows (e.g. a
+    yearly and a monthly extract of the same year): each file's cleanup would
+    delete rows the other one loads.
+    """
+    windows = []
+    for path in paths:
+        try:
+            windows.append((*parse_date_range_from_filename(os.path.basename(path)), os.path.basename(path)))
+        except ValueError:
+            continue  # no window: nothing is cleaned up for this file
+    windows.sort()
+    for (_, prev_end, prev), (start, _, name) in zip(windows, windows[1:]):
+        if start < prev_end:
+            raise ValueError(f"{prev} and {name} cover overlapping date windows; load them in separate runs")
+
+
+def ingest_files(paths: list[str]) -> None:
+    """
+    Ingest several files, FILE_WORKERS processes at a time, largest first.
+
+    Every file is its own ingest_file() run (own connection, ingestion_log
+    row, cleanup window and checkpoints), so a rerun skips files already
+    loaded and a failed file does not stop the others. With enough workers
+    the batch takes about as long as its largest file.
+    """
+    check_window_overlaps(paths)
+    total_bytes = sum(os.path.getsize(p) for p in paths)
+    print(f"[🗂] {len(paths)} files ({total_bytes / 1024**3:.2f} GB), {FILE_WORKERS} file workers, largest first")
+    
+    # Created once up front so concurrent workers never race on the ALTERs
+    conn = open_connection()
+    try:
+        create_ingestion_log_table(conn)
+        create_checkpoint_table(conn)
+    finally:
+        conn.close()
+    
+    batch_start = time.time()
+    outcomes, errors = [], []
+    if FILE_WORKERS <= 1:
+        for path in paths:
+            try:
+                outcomes.append(ingest_file(path))
+            except Exception as e:
+                errors.append((os.path.basename(path), e))
+    else:
+        # Tasks start in submission order, i.e. largest file first
+        with ProcessPoolExecutor(max_workers=FILE_WORKERS) as pool:
+            futures = {pool.submit(ingest_file, path): os.path.basename(path) for path in paths}
+            for future in as_completed(futures):
+                try:
+                    outcomes.append(future.result())
+                except Exception as e:
+                    errors.append((futures[future], e))
+    wall = time.time() - batch_start
+    
+    loaded = [o for o in outcomes if o["status"] == "loaded"]
+    print(f"\n[🗂] BATCH COMPLETE: {len(loaded)} loaded, {len(outcomes) - len(loaded)} skipped, "
+          f"{len(errors)} failed")
+    if loaded:
+        rows = sum(o["rows"] for o in loaded)
+        print(f"   {rows:,} rows in {wall:.1f}s wall (sum of file times {sum(o['elapsed'] for o in loaded):.1f}s, "
+              f"largest {max(o['elapsed'] for o in loaded):.1f}s)")
+    for name, e in errors:
+        print(f"   [❌] {name}: {e}")
+    if errors:
+        raise RuntimeError(f"{len(errors)} of {len(paths)} files failed; re-run to retry them")
+
+
+def ingest_mysql() -> None:
+    """Ingest NYC311_CSV: one file, or a directory/glob of files (see ingest_files)."""
+    validate_config()
+    paths = resolve_input_files(CSV_FILENAME)
+    if len(paths) == 1:
+        ingest_file(paths[0])
+    else:
+        ingest_files(paths)
 
 
 if __name__ == "__main__":
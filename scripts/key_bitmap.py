@@ -0,0 +1,50 @@
+"""
+Compact "seen" set for integer unique_keys across the chunks of one load.
+
+NYC 311 unique_keys are dense positive integers (tens of millions), so a
+bitmap indexed by the key itself costs one bit per possible key: about
+7.5 MB for the whole export, versus gigabytes for a Python set. Lookups
+and inserts for a chunk are a single vectorized pass.
+"""
+
+import numpy as np
+
+# Keys outside [0, MAX_TRACKED_KEY) are never reported as seen (bitmap <= 256 MB)
+MAX_TRACKED_KEY = 1 << 31
+
+
+def new_key_bitmap() -> dict:
+    """Empty bitmap; grows on demand up to MAX_TRACKED_KEY bits."""
+    return {"bits": np.zeros(0, dtype=np.uint8)}
+
+
+def _grow(bitmap: dict, max_key: int) -> None:
+    """Resize to hold max_key, doubling so repeated growth stays amortized (capped at 256 MB)."""
+    needed = max_key // 8 + 1
+    bits = bitmap["bits"]
+    if needed > len(bits):
+        grown = np.zeros(min(max(needed, 2 * len(bits)), MAX_TRACKED_KEY // 8), dtype=np.uint8)
+        grown[:len(bits)] = bits
+        bitmap["bits"] = grown
+
+
+def mark_seen(bitmap: dict, keys: np.ndarray) -> np.ndarray:
+    """
+    Add `keys` to the bitmap; return a mask of the ones already present.
+
+    Keys must be unique within one call (clean_chunk drops in-chunk
+    duplicates first), since they are all checked before any is added.
+    """
+    keys = np.asarray(keys, dtype=np.int64)
+    seen = np.zeros(len(keys), dtype=bool)
+    tracked = (keys >= 0) & (keys < MAX_TRACKED_KEY)
+    if not tracked.any():
+        return seen
+
+    k = keys[tracked]
+    _grow(bitmap, int(k.max()))
+    byte = k >> 3
+    bit = np.left_shift(1, k & 7).astype(np.uint8)
+    seen[tracked] = (bitmap["bits"][byte] & bit) != 0
+    np.bitwise_or.at(bitmap["bits"], byte, bit)  # .at: several keys may share a byte
+    return seen
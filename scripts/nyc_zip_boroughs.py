@@ -0,0 +1,88 @@
+"""
+NYC ZIP code -> borough lookup tables.
+
+Built once at import as flat int8 arrays so a whole column of ZIPs can be
+resolved with a single numpy fancy-index instead of a per-row dict lookup.
+Code 0 means "not an NYC ZIP"; BOROUGHS[code - 1] is the borough name.
+"""
+
+import numpy as np
+import pandas as pd
+
+BOROUGHS = ["MANHATTAN", "BRONX", "BROOKLYN", "QUEENS", "STATEN ISLAND"]
+
+# USPS 5-digit ZIP ranges (inclusive) delivered within each borough
+NYC_ZIP_RANGES = [
+    (10001, 10282, "MANHATTAN"),
+    (10301, 10314, "STATEN ISLAND"),
+    (10451, 10475, "BRONX"),
+    (11004, 11005, "QUEENS"),
+    (11101, 11120, "QUEENS"),
+    (11201, 11256, "BROOKLYN"),
+    (11351, 11385, "QUEENS"),
+    (11411, 11436, "QUEENS"),
+    (11691, 11697, "QUEENS"),
+]
+
+# 3-digit prefixes, for truncated/malformed ZIPs that miss the 5-digit table
+NYC_ZIP_PREFIXES = {
+    "100": "MANHATTAN", "101": "MANHATTAN", "102": "MANHATTAN",
+    "103": "STATEN ISLAND", "104": "BRONX",
+    "111": "QUEENS", "112": "BROOKLYN", "113": "QUEENS",
+    "114": "QUEENS", "116": "QUEENS"
+}
+
+
+def _build_tables() -> tuple[np.ndarray, np.ndarray]:
+    zip5 = np.zeros(100_000, dtype=np.int8)
+    for start, end, borough in NYC_ZIP_RANGES:
+        zip5[start:end + 1] = BOROUGHS.index(borough) + 1
+    zip3 = np.zeros(1_000, dtype=np.int8)
+    for prefix, borough in NYC_ZIP_PREFIXES.items():
+        zip3[int(prefix)] = BOROUGHS.index(borough) + 1
+    return zip5, zip3
+
+
+ZIP5_TO_BOROUGH, ZIP3_TO_BOROUGH = _build_tables()
+_BOROUGH_LOOKUP = np.array([None] + BOROUGHS, dtype=object)
+
+
+def _leading_int(text: pd.Series, width: int) -> np.ndarray:
+    """First `width` characters as an int (-1 when short or not all digits)."""
+    head = text.str.slice(0, width)
+    ok = head.str.fullmatch(r"\d{%d}" % width).fillna(False).to_numpy(dtype=bool)
+    values = np.full(len(text), -1, dtype=np.int64)
+    if ok.any():
+        values[ok] = head[ok].astype(np.int64).to_numpy()
+    return values
+
+
+def _borough_codes(text: pd.Series) -> np.ndarray:
+    """Borough code per ZIP string: 5-digit table first, then 3-digit prefix."""
+    codes = np.zeros(len(text), dtype=np.int8)
+
+    zip5 = _leading_int(text, 5)
+    has5 = zip5 >= 0
+    codes[has5] = ZIP5_TO_BOROUGH[zip5[has5]]
+
+    missing = codes == 0
+    if missing.any():
+        zip3 = _leading_int(text[missing], 3)
+        has3 = zip3 >= 0
+        fallback = np.zeros(len(zip3), dtype=np.int8)
+        fallback[has3] = ZIP3_TO_BOROUGH[zip3[has3]]
+        codes[missing] = fallback
+    return codes
+
+
+def boroughs_from_zips(zips: pd.Series) -> pd.Series:
+    """
+    Vectorized ZIP -> borough (None where unknown), index-aligned with `zips`.
+
+    A column holds only a few hundred distinct ZIPs, so they are factorized
+    and each distinct value is resolved once before mapping back.
+    """
+    values, uniques = pd.factorize(zips)
+    unique_codes = np.append(_borough_codes(pd.Series(uniques).astype("string")), np.int8(0))
+    codes = unique_codes[values]  # NA sentinel -1 picks the trailing "unknown" slot
+    return pd.Series(_BOROUGH_LOOKUP[codes], index=zips.index, dtype=object)
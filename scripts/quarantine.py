@@ -0,0 +1,120 @@
+"""
+Quarantine for rows the ingestion drops.
+
+clean_chunk() (and the cross-chunk dedupe) hand their rejected rows over
+with a reason code; a sink streams them into a per-run Parquet dataset
+(one part file per writing process, zstd-compressed, reason stored as a
+dictionary column) so drops can be inspected with e.g.
+pd.read_parquet(run_dir) instead of re-scanning the source CSV.
+Values are the parsed ones: an unparseable date shows up as null.
+"""
+
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: only needed for QUARANTINE_DIR
+    pa = None
+    pq = None
+
+# reason code -> cleaning_stats counter
+REJECT_REASONS = {
+    "missing_required": "dropped_required",
+    "duplicate_key": "dropped_dupes",
+    "outside_nyc_bounds": "nyc_bounds_filtered",
+    "duplicate_across_chunks": "cross_chunk_dupes",
+}
+# Rejects are buffered into row groups of about this many rows
+ROW_GROUP_ROWS = 65536
+
+_TIMESTAMP_COLS = ("created_date", "closed_date")
+_FLOAT_COLS = ("latitude", "longitude")
+_STRING_COLS = ("agency", "complaint_type", "descriptor", "borough", "incident_zip")
+
+
+def quarantine_schema():
+    """Fixed schema so every chunk appends to the same file."""
+    return pa.schema(
+        [("chunk", pa.int32()), ("reason", pa.dictionary(pa.int8(), pa.string())),
+         ("unique_key", pa.int64())]
+        + [(c, pa.timestamp("s")) for c in _TIMESTAMP_COLS]
+        + [(c, pa.string()) for c in _STRING_COLS]
+        + [(c, pa.float64()) for c in _FLOAT_COLS]
+    )
+
+
+def rejected_rows(df: pd.DataFrame, mask, reason: str) -> pd.DataFrame:
+    """Rows of `df` selected by `mask`, tagged with a REJECT_REASONS code."""
+    rows = df[mask].copy()
+    rows["reason"] = reason
+    return rows
+
+
+def _to_arrow(rejects: pd.DataFrame, chunk_num: int):
+    """Coerce a reject frame (whatever dtypes its chunk had) to quarantine_schema()."""
+    def column(col):
+        return rejects[col] if col in rejects else pd.Series(None, index=rejects.index, dtype=object)
+    
+    columns = {
+        "chunk": pa.array([chunk_num] * len(rejects), pa.int32()),
+        "reason": pa.array(rejects["reason"].astype(str), pa.string()).dictionary_encode()
+                    .cast(pa.dictionary(pa.int8(), pa.string())),
+        "unique_key": pa.array(pd.to_numeric(column("unique_key"), errors="coerce").astype("Int64")),
+    }
+    for col in _TIMESTAMP_COLS:
+        values = pd.to_datetime(column(col), errors="coerce").dt.floor("s")
+        columns[col] = pa.array(values, from_pandas=True).cast(pa.timestamp("s"))
+    for col in _STRING_COLS:
+        columns[col] = pa.array(column(col).astype("string")).cast(pa.string())
+    for col in _FLOAT_COLS:
+        columns[col] = pa.array(pd.to_numeric(column(col), errors="coerce"), pa.float64(), from_pandas=True)
+    return pa.table(columns, schema=quarantine_schema())
+
+
+def open_quarantine(run_dir: str | None, part: int = 0) -> dict | None:
+    """Sink writing `run_dir`/part-<part>.parquet, or None when quarantine is off."""
+    if not run_dir:
+        return None
+    if pq is None:
+        raise RuntimeError("QUARANTINE_DIR requires pyarrow (pip install pyarrow)")
+    os.makedirs(run_dir, exist_ok=True)
+    return {"path": os.path.join(run_dir, f"part-{part}.parquet"), "writer": None,
+            "buffer": [], "buffered": 0, "rows": 0}
+
+
+def _flush(sink: dict) -> None:
+    if not sink["buffer"]:
+        return
+    if sink["writer"] is None:
+        sink["writer"] = pq.ParquetWriter(sink["path"], quarantine_schema(), compression="zstd")
+    sink["writer"].write_table(pa.concat_tables(sink["buffer"]).unify_dictionaries().combine_chunks())
+    sink["buffer"], sink["buffered"] = [], 0
+
+
+def quarantine_rejects(sink: dict | None, stats: dict, chunk_num: int) -> None:
+    """
+    Move stats["rejected"] (set by clean_chunk/drop_seen_keys) into the sink.
+
+    Always pops the frame, so cleaning stats kept for the run stay small.
+    """
+    rejects = stats.pop("rejected", None)
+    if sink is None or rejects is None or rejects.empty:
+        return
+    sink["buffer"].append(_to_arrow(rejects, chunk_num))
+    sink["buffered"] += len(rejects)
+    sink["rows"] += len(rejects)
+    if sink["buffered"] >= ROW_GROUP_ROWS:
+        _flush(sink)
+
+
+def close_quarantine(sink: dict | None) -> int:
+    """Flush and close a sink; return how many rows it quarantined."""
+    if sink is None:
+        return 0
+    _flush(sink)
+    if sink["writer"] is not None:
+        sink["writer"].close()
+    return sink["rows"]
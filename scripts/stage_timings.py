@@ -0,0 +1,67 @@
+"""
+Per-stage timing for the ingestion pipeline.
+
+Every chunk carries a {stage: seconds} dict (in its cleaning stats) that the
+reader, cleaner and writer each add to, wherever they run: parse/clean
+timings come back from worker processes with the chunk. At the end of a
+run the dicts are aggregated into p50/p95/max per stage.
+"""
+
+import contextlib
+import time
+
+import numpy as np
+
+# Display order; cleaning sub-steps are prefixed "clean."
+STAGES = ["read", "parse", "clean.dates", "clean.numerics", "clean.required_dupes",
+          "clean.boroughs", "clean.bounds", "cache", "dedupe", "dimensions", "encode",
+          "insert", "commit", "checkpoint"]
+
+
+@contextlib.contextmanager
+def timed(stages: dict | None, name: str):
+    """Add the duration of the block to stages[name] (no-op when stages is None)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if stages is not None:
+            stages[name] = stages.get(name, 0.0) + time.perf_counter() - start
+
+
+def iter_timed(items):
+    """Yield (item, seconds spent producing it) from any iterator."""
+    items = iter(items)
+    while True:
+        start = time.perf_counter()
+        item = next(items, None)
+        if item is None:
+            return
+        yield item, time.perf_counter() - start
+
+
+def summarize_stages(per_chunk: list[dict]) -> dict:
+    """{stage: {chunks, total, p50, p95, max}} over the per-chunk stage dicts."""
+    names = sorted({name for stages in per_chunk for name in stages},
+                   key=lambda n: (STAGES.index(n) if n in STAGES else len(STAGES), n))
+    summary = {}
+    for name in names:
+        values = np.array([stages[name] for stages in per_chunk if name in stages])
+        summary[name] = {
+            "chunks": len(values),
+            "total": float(values.sum()),
+            "p50": float(np.percentile(values, 50)),
+            "p95": float(np.percentile(values, 95)),
+            "max": float(values.max()),
+        }
+    return summary
+
+
+def chunk_breakdown(stages: dict) -> str:
+    """Compact one-line breakdown for the per-chunk telemetry (clean.* summed)."""
+    grouped: dict = {}
+    for name, seconds in stages.items():
+        key = name.split(".", 1)[0]
+        grouped[key] = grouped.get(key, 0.0) + seconds
+    order = [s for s in dict.fromkeys(n.split(".", 1)[0] for n in STAGES) if s in grouped]
+    return ", ".join(f"{name} {grouped[name]:.2f}s" for name in order)
@@ -0,0 +1,39 @@
+-- Optional: range-partition service_requests by year of created_date so that a
+-- whole year can be reloaded with EXCHANGE PARTITION (RELOAD_STRATEGY=exchange
+-- in scripts/ingest_mysql.py) instead of a multi-million-row DELETE.
+--
+-- MySQL requires every unique key to include the partitioning column, so the
+-- primary key becomes (unique_key, created_date). unique_key is still unique in
+-- practice; upserts now match on both columns.
+--
+-- Years outside p2010..p2026 land in p_old / pmax; ingestion splits pmax into
+-- per-year partitions on demand.
+
+USE nyc311;
+
+ALTER TABLE service_requests
+  DROP PRIMARY KEY,
+  ADD PRIMARY KEY (unique_key, created_date);
+
+ALTER TABLE service_requests
+  PARTITION BY RANGE (YEAR(created_date)) (
+    PARTITION p_old VALUES LESS THAN (2010),
+    PARTITION p2010 VALUES LESS THAN (2011),
+    PARTITION p2011 VALUES LESS THAN (2012),
+    PARTITION p2012 VALUES LESS THAN (2013),
+    PARTITION p2013 VALUES LESS THAN (2014),
+    PARTITION p2014 VALUES LESS THAN (2015),
+    PARTITION p2015 VALUES LESS THAN (2016),
+    PARTITION p2016 VALUES LESS THAN (2017),
+    PARTITION p2017 VALUES LESS THAN (2018),
+    PARTITION p2018 VALUES LESS THAN (2019),
+    PARTITION p2019 VALUES LESS THAN (2020),
+    PARTITION p2020 VALUES LESS THAN (2021),
+    PARTITION p2021 VALUES LESS THAN (2022),
+    PARTITION p2022 VALUES LESS THAN (2023),
+    PARTITION p2023 VALUES LESS THAN (2024),
+    PARTITION p2024 VALUES LESS THAN (2025),
+    PARTITION p2025 VALUES LESS THAN (2026),
+    PARTITION p2026 VALUES LESS THAN (2027),
+    PARTITION pmax VALUES LESS THAN MAXVALUE
+  );
@@ -0,0 +1,12 @@
+-- Secondary indexes for the analytic queries in ingest_mysql.py
+-- (run_data_quality_checks), concurrent_ops.py and the anomaly job.
+--
+-- Large loads should run with DEFER_INDEXES=true so that ingestion drops
+-- these before inserting and rebuilds them once at the end, instead of
+-- maintaining three B-trees row by row.
+
+USE nyc311;
+
+CREATE INDEX idx_sr_created_date ON service_requests (created_date);
+CREATE INDEX idx_sr_borough_complaint ON service_requests (borough, complaint_type);
+CREATE INDEX idx_sr_closed_date ON service_requests (closed_date);
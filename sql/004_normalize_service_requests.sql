@@ -0,0 +1,86 @@
+-- Optional: dictionary-encode agency, complaint_type, descriptor and borough.
+--
+-- The repeated VARCHARs move into small-int dimension tables and the rows into
+-- service_requests_fact (~40 bytes/row instead of ~150). service_requests
+-- becomes a view joining them back, so existing SELECTs keep working.
+-- Ingestion writes to the fact table when SCHEMA_MODE=normalized in
+-- scripts/ingest_mysql.py, adding new dimension values on the fly.
+--
+-- Writes must target service_requests_fact: MySQL rejects DELETE, and UPDATE
+-- ... LIMIT, through a multi-table view. Aggregates are fastest on the codes,
+-- e.g. GROUP BY f.borough_id joined to dim_borough afterwards.
+-- scripts/concurrent_ops.py does both when SCHEMA_MODE=normalized.
+--
+-- Apply to an unpartitioned service_requests (without sql/002).
+
+USE nyc311;
+
+-- utf8mb4_0900_bin (case-sensitive, NO PAD): codes map exact strings
+CREATE TABLE IF NOT EXISTS dim_agency (
+  agency_id SMALLINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+  agency VARCHAR(16) COLLATE utf8mb4_0900_bin NOT NULL UNIQUE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS dim_complaint_type (
+  complaint_type_id SMALLINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+  complaint_type VARCHAR(128) COLLATE utf8mb4_0900_bin NOT NULL UNIQUE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS dim_descriptor (
+  descriptor_id MEDIUMINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+  descriptor VARCHAR(255) COLLATE utf8mb4_0900_bin NOT NULL UNIQUE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS dim_borough (
+  borough_id TINYINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+  borough VARCHAR(32) COLLATE utf8mb4_0900_bin NOT NULL UNIQUE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS service_requests_fact (
+  unique_key BIGINT PRIMARY KEY,
+  created_date DATETIME NOT NULL,
+  closed_date DATETIME NULL,
+  agency_id SMALLINT UNSIGNED NULL,
+  complaint_type_id SMALLINT UNSIGNED NULL,
+  descriptor_id MEDIUMINT UNSIGNED NULL,
+  borough_id TINYINT UNSIGNED NULL,
+  latitude DECIMAL(9,6),
+  longitude DECIMAL(9,6),
+  INDEX idx_srf_created_date (created_date),
+  INDEX idx_srf_borough_complaint (borough_id, complaint_type_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- Move existing rows over
+INSERT IGNORE INTO dim_agency (agency)
+  SELECT DISTINCT agency COLLATE utf8mb4_0900_bin FROM service_requests WHERE agency IS NOT NULL;
+INSERT IGNORE INTO dim_complaint_type (complaint_type)
+  SELECT DISTINCT complaint_type COLLATE utf8mb4_0900_bin FROM service_requests WHERE complaint_type IS NOT NULL;
+INSERT IGNORE INTO dim_descriptor (descriptor)
+  SELECT DISTINCT descriptor COLLATE utf8mb4_0900_bin FROM service_requests WHERE descriptor IS NOT NULL;
+INSERT IGNORE INTO dim_borough (borough)
+  SELECT DISTINCT borough COLLATE utf8mb4_0900_bin FROM service_requests WHERE borough IS NOT NULL;
+
+INSERT IGNORE INTO service_requests_fact
+  SELECT s.unique_key, s.created_date, s.closed_date,
+         a.agency_id, c.complaint_type_id, d.descriptor_id, b.borough_id,
+         s.latitude, s.longitude
+  FROM service_requests s
+  LEFT JOIN dim_agency a ON a.agency = s.agency COLLATE utf8mb4_0900_bin
+  LEFT JOIN dim_complaint_type c ON c.complaint_type = s.complaint_type COLLATE utf8mb4_0900_bin
+  LEFT JOIN dim_descriptor d ON d.descriptor = s.descriptor COLLATE utf8mb4_0900_bin
+  LEFT JOIN dim_borough b ON b.borough = s.borough COLLATE utf8mb4_0900_bin;
+
+RENAME TABLE service_requests TO service_requests_wide;
+
+-- Compatibility view with the original column list
+CREATE OR REPLACE VIEW service_requests AS
+  SELECT f.unique_key, f.created_date, f.closed_date,
+         a.agency, c.complaint_type, d.descriptor, b.borough,
+         f.latitude, f.longitude
+  FROM service_requests_fact f
+  LEFT JOIN dim_agency a ON a.agency_id = f.agency_id
+  LEFT JOIN dim_complaint_type c ON c.complaint_type_id = f.complaint_type_id
+  LEFT JOIN dim_descriptor d ON d.descriptor_id = f.descriptor_id
+  LEFT JOIN dim_borough b ON b.borough_id = f.borough_id;
+
+-- Once the view is verified: DROP TABLE service_requests_wide;